@@ -195,11 +195,18 @@ class Ui_DlgCountersunktHoles(object):
             translate("DlgCountersunktHoles", "Diameter"),
             QtCore.Qt.DisplayRole,
         )
+        # classify all edges in one pass: valid edge name -> row, radius
+        self.edgeIndex = FastenerBase.FSEdgeIndex(baseObj.Shape)
         edges = []
-        for i in range(len(baseObj.Shape.Edges)):
-            edge = "Edge" + str(i + 1)
-            if FSIsValidEdge(baseObj, edge):
-                edges.append(edge)
+        self.edgeRows = {}
+        self.edgeRadius = {}
+        for i, edge in enumerate(self.edgeIndex.Edges):
+            if hasattr(edge, "Curve") and hasattr(edge.Curve, "Center"):
+                name = "Edge" + str(i + 1)
+                self.edgeRows[name] = len(edges)
+                edges.append(name)
+                if hasattr(edge.Curve, "Radius"):
+                    self.edgeRadius[name] = edge.Curve.Radius
         nedges = len(edges)
         dm.insertRows(0, nedges)
 
@@ -253,7 +260,9 @@ class Ui_DlgCountersunktHoles(object):
 
     def fillDiameters(self, type):
         self.diamTable = cshGetTable(type)
+        self.diamIndex = FastenerBase.FSDiameterIndex(self.diamTable, -1)
         self.diamList = sorted(self.diamTable, key=FastenerBase.MToFloat)
+        self.closestDiams = {}
         self.comboDiameter.clear()
         self.comboDiameter.addItems(self.diamList)
 
@@ -275,28 +284,29 @@ class Ui_DlgCountersunktHoles(object):
 
     def AddEdges(self, obj, edges):
         dm = self.model
-        nedges = dm.rowCount()
         self.treeView.selectionModel().clearSelection()
         self.itemRefreshDisabled = True
         for edge in edges:
             # FreeCAD.Console.PrintLog("Diam Table:" + str(edge) + "\n")
-            for i in range(nedges):
-                if dm.data(dm.index(i, 0)) == edge:
-                    m = FastenerBase.FSAutoDiameterM(
-                        obj.Shape.getElement(edge), self.diamTable, -1
-                    )
-                    index = dm.index(i, 0)
-                    dm.setData(index, QtCore.Qt.Checked,
-                               QtCore.Qt.CheckStateRole)
-                    dm.setData(dm.index(i, 1), m)
-                    if QTVer >= 5:
-                        self.treeView.selectionModel().select(
-                            index, QtCore.QItemSelectionModel.Select
-                        )
-                    else:
-                        self.treeView.selectionModel().select(
-                            index, QtGui.QItemSelectionModel.Select
-                        )
+            i = self.edgeRows.get(edge)
+            if i is None:
+                continue
+            if edge in self.edgeRadius:
+                m = self.diamIndex.Find(self.edgeRadius[edge] * 2)
+            else:
+                m = "M5"
+            index = dm.index(i, 0)
+            dm.setData(index, QtCore.Qt.Checked,
+                       QtCore.Qt.CheckStateRole)
+            dm.setData(dm.index(i, 1), m)
+            if QTVer >= 5:
+                self.treeView.selectionModel().select(
+                    index, QtCore.QItemSelectionModel.Select
+                )
+            else:
+                self.treeView.selectionModel().select(
+                    index, QtGui.QItemSelectionModel.Select
+                )
 
         self.itemRefreshDisabled = False
         dm.itemChanged.emit(None)
@@ -305,7 +315,12 @@ class Ui_DlgCountersunktHoles(object):
         return self.comboScrewType.currentText()
 
     def GetClosest(self, diam):
-        if diam in self.diamList:
+        if diam not in self.closestDiams:
+            self.closestDiams[diam] = self.FindClosest(diam)
+        return self.closestDiams[diam]
+
+    def FindClosest(self, diam):
+        if diam in self.diamTable:
             return diam
         d = FastenerBase.MToFloat(diam)
         l = len(self.diamList)
@@ -574,12 +589,13 @@ class FSTaskFilletDialog:
             if face is None:
                 return
             edges = []
+            edgeIndex = self.form.ui.edgeIndex
             for edge in face.Edges:
                 if not (hasattr(edge, "Curve")):
                     continue
                 if not (hasattr(edge.Curve, "Center")):
                     continue
-                edges.append(FastenerBase.GetEdgeName(obj.Shape, edge))
+                edges.append(edgeIndex.GetEdgeName(edge))
             self.form.ui.AddEdges(obj, edges)
         self.RefreshSelection()
 
@@ -697,12 +713,16 @@ def cshMakeFace(m, d, k):
     return fm.GetFace()
 
 
+cshTables = {}
+
+
 def cshGetTable(type):
-    if type == "Default":
-        table = FSCSHTable
-    else:
-        table = screwMaker.GetCountersunkDiams(type)
-    return table
+    if type not in cshTables:
+        if type == "Default":
+            cshTables[type] = FSCSHTable
+        else:
+            cshTables[type] = screwMaker.GetCountersunkDiams(type)
+    return cshTables[type]
 
 
 def cshMakeCSHole(diam, type):
@@ -710,7 +730,7 @@ def cshMakeCSHole(diam, type):
     if not (diam in table):
         return None
 
-    (key, shape) = FastenerBase.FSGetKey("CSHole", diam, 0)
+    (key, shape) = FastenerBase.FSGetKey("CSHole", type, diam, 0)
     if shape is not None:
         return shape
 
@@ -751,17 +771,28 @@ class FSCountersunkObject:
         '''"Print a short message when doing a recomputation, this method is mandatory"'''
         # fp.Shape = Part.makeBox(1,1,1 + len(fp.diameters))
         origshape = fp.BaseObject[0].Shape
-        shape = origshape
+        holes = []
         for diam in fp.diameters:
             FreeCAD.Console.PrintLog(
                 "Generating hole tool for: " + diam + "\n")
             edge, m, f, o, type = cshSplitEdgeDiam(diam)
             cshole = cshMakeCSHole(m, type)
-            FastenerBase.FSMoveToObject(
-                cshole, origshape.getElement(edge), f == "1", float(o)
-            )
-            shape = shape.cut(cshole)
-        fp.Shape = shape
+            if cshole is None:
+                continue
+            pnt, axis = FastenerBase.FSGetAttachmentFrame(origshape.getElement(edge))
+            if axis is None:
+                continue
+            holes.append((cshole, pnt, axis, f == "1", float(o)))
+        if len(holes) == 0:
+            fp.Shape = origshape
+            return
+        # the cached hole shapes are not moved, located copies of them are
+        # used as tools for a single cut
+        placements = FastenerBase.FSComputePlacements(
+            [h[1] for h in holes], [h[2] for h in holes], [h[3] for h in holes],
+            [h[4] for h in holes], [0.0] * len(holes))
+        tools = [FastenerBase.FSLocatedShape(h[0], pl) for h, pl in zip(holes, placements)]
+        fp.Shape = origshape.cut(tools)
 
     def loads(self, state):
         FreeCAD.Console.PrintWarning(translate("CountersunkDeprecation", "The Fasteners Workbench countersunk holes feature is deprecated, and may be removed in the future. Please consider using a PartDesign Hole feature instead") + "\n")
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   Copyright (c) 2026 - FreeCAD FastenersWB Authors                      *
+*                                                                         *
+*   This file is a supplement to the FreeCAD CAx development system.      *
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+*   as published by the Free Software Foundation; either version 2 of     *
+*   the License, or (at your option) any later version.                   *
+*   for detail see the LICENCE text file.                                 *
+*                                                                         *
+*   This software is distributed in the hope that it will be useful,      *
+*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+*   GNU Library General Public License for more details.                  *
+*                                                                         *
+*   You should have received a copy of the GNU Library General Public     *
+*   License along with this macro; if not, write to the Free Software     *
+*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+*   USA                                                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+# Bill of material generation. This module does not need the GUI, so the BOM
+# can also be created from FreeCADCmd:
+#   import FSBom
+#   FSBom.FSExportBom(FreeCAD.openDocument("assembly.FCStd"), "bom.csv")
+
+import os
+import csv
+import tempfile
+import FreeCAD
+from FastenerBase import FSParam
+from FastenerBase import FSRemoveDigits
+from FastenerBase import FSScrewStr
+from FastenerBase import GetTotalObjectRepeats
+from FSutils import FSBomWriter
+from FSutils import FSBomCsvWriter
+from FSutils import FSBomJsonLinesWriter
+from FSutils import FSBomJsonWriter
+from FSutils import FSWriteBom
+
+translate = FreeCAD.Qt.translate
+
+
+class FSBomCollector:
+    """Count the fasteners of a document, keyed by fastener description"""
+
+    def __init__(self):
+        self.fastenerDB = {}
+        self.repeats = {}  # counts of all visited objects and containers
+
+    def AddDocument(self, doc):
+        for obj in doc.Objects:
+            self.AddObject(obj)
+
+    def AddObject(self, obj):
+        name = FSRemoveDigits(obj.Name)
+        method = getattr(self, "Add" + name, None)
+        if method is None:
+            return
+        # get total count
+        cnt = GetTotalObjectRepeats(obj, self.repeats)
+        if hasattr(obj, "Holes"):
+            # fastener patterns hold one fastener per usable hole
+            if hasattr(obj, "FastenerCount"):
+                cnt *= obj.FastenerCount
+            else:
+                cnt *= sum(len(subs) for baseobj, subs in obj.Holes)
+        FreeCAD.Console.PrintLog("Using method: Add" + obj.Name + "\n")
+        method(obj, cnt)
+
+    def AddFastener(self, fastener, cnt):
+        if fastener in self.fastenerDB:
+            self.fastenerDB[fastener] = self.fastenerDB[fastener] + cnt
+        else:
+            self.fastenerDB[fastener] = cnt
+
+    def AddScrew(self, obj, cnt):
+        desc = obj.Type + translate("FastenerBase", " Screw ") + FSScrewStr(obj)
+        self.AddFastener(desc, cnt)
+
+    def AddNut(self, obj, cnt):
+        if hasattr(obj, "Type"):
+            type = obj.Type
+        else:
+            type = "ISO4033"
+        self.AddFastener(type + translate("FastenerBase", " Nut ") + obj.Diameter, cnt)
+
+    def AddWasher(self, obj, cnt):
+        self.AddFastener(obj.Type + translate("FastenerBase", " Washer ") + obj.Diameter, cnt)
+
+    def AddThreadedRod(self, obj, cnt):
+        desc = translate("FastenerBase", "Threaded Rod ") + FSScrewStr(obj)
+        self.AddFastener(desc, cnt)
+
+    def AddPressNut(self, obj, cnt):
+        self.AddFastener(translate("FastenerBase", "PEM PressNut ") + obj.Diameter + "-" + obj.Tcode, cnt)
+
+    def AddStandoff(self, obj, cnt):
+        self.AddFastener(translate("FastenerBase", "PEM Standoff ") + obj.Diameter + "x" + obj.Length, cnt)
+
+    def AddStud(self, obj, cnt):
+        self.AddFastener(translate("FastenerBase", "PEM Stud ") + obj.Diameter + "x" + obj.Length, cnt)
+
+    def AddPcbStandoff(self, obj, cnt):
+        self.AddFastener(
+            translate("FastenerBase", "PCB Standoff ") + obj.Diameter + "x" + obj.Width + "x" + obj.Length, cnt
+        )
+
+    def AddHeatSet(self, obj, cnt):
+        self.AddFastener(translate("FastenerBase", "Heat Set Insert ") + obj.Diameter, cnt)
+
+    def AddRetainingRing(self, obj, cnt):
+        self.AddFastener(obj.Type + translate("FastenerBase", " Retaining Ring ") + obj.Diameter, cnt)
+
+    def AddTSlot(self, obj, cnt):
+        if obj.Type == "GN505.4":
+            self.AddFastener(
+                obj.Type + translate("FastenerBase", " T-Slot Bolt ") + obj.Diameter + " " + obj.SlotWidth, cnt
+            )
+        else:
+            self.AddFastener(
+                obj.Type + translate("FastenerBase", " T-Slot Nut ") + obj.Diameter + " " + obj.SlotWidth, cnt
+            )
+
+    def AddHexKey(self, obj, cnt):
+        self.AddFastener(obj.Type + translate("FastenerBase", " Hex key ") + obj.Diameter + "mm", cnt)
+
+    def AddNail(self, obj, cnt):
+        self.AddFastener(obj.Type + translate("FastenerBase", " Nail ") + obj.Diameter, cnt)
+
+    def AddPin(self, obj, cnt):
+        self.AddFastener(obj.Type + translate("Fastenerbase", " Pin ") + obj.Diameter + "x" + obj.Length, cnt)
+
+
+def FSGetBom(doc=None):
+    """Return the BOM of a document as {fastener description: quantity}"""
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    collector = FSBomCollector()
+    collector.AddDocument(doc)
+    return collector.fastenerDB
+
+
+############################### BOM writers ###################################
+
+# the csv and json stream writers are in FSutils, they do not need FreeCAD
+
+class FSBomSheetWriter(FSBomWriter):
+    """Write the BOM into a new spreadsheet of the document.
+    The lines are buffered in a temporary file which is imported into the
+    sheet at once, instead of setting every cell separately"""
+
+    def __init__(self, doc, sheet=None):
+        self.doc = doc
+        self.sheet = sheet  # existing sheet to overwrite
+
+    def Begin(self):
+        self.file = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="", encoding="utf-8")
+        # match the format expected by Sheet.importFile
+        self.writer = csv.writer(self.file, delimiter="\t", quotechar='"', escapechar="\\", doublequote=False)
+        self.writer.writerow([translate("FastenerBase", "Type"), translate("FastenerBase", "Qty")])
+
+    def WriteLine(self, fastener, qty):
+        self.writer.writerow([fastener, qty])
+
+    def End(self):
+        self.file.close()
+        try:
+            sheet = self.sheet
+            if sheet is None:
+                sheet = self.doc.addObject("Spreadsheet::Sheet", "Fasteners_BOM")
+                sheet.Label = translate("FastenerBase", "Fasteners_BOM")
+            sheet.importFile(self.file.name, "\t", '"', "\\")
+            sheet.setColumnWidth("A", 300)
+            # only the new sheet needs to be evaluated
+            sheet.recompute()
+            self.sheet = sheet
+        finally:
+            os.remove(self.file.name)
+
+
+def FSExportBom(doc, filename):
+    """Export the BOM of a document to a file. Files ending with .jsonl are
+    written as JSON Lines, .json as a json array and all others as csv"""
+    bom = FSGetBom(doc)
+    ext = os.path.splitext(filename)[1].lower()
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        if ext == ".jsonl":
+            writer = FSBomJsonLinesWriter(f)
+        elif ext == ".json":
+            writer = FSBomJsonWriter(f)
+        else:
+            writer = FSBomCsvWriter(f)
+        FSWriteBom(bom, writer)
+
+
+################################# Live BOM ####################################
+
+# fastener properties that change the BOM description or count
+FSBomProperties = (
+    "Type", "Diameter", "DiameterCustom", "Length", "LengthCustom", "LeftHanded",
+    "Tcode", "Width", "SlotWidth", "Visibility", "Holes", "FastenerCount",
+)
+# container (part, link, array) properties that change the count of their children
+FSBomContainerProperties = (
+    "Group", "LinkedObject", "ElementCount", "VisibilityList", "Base", "Count",
+    "NumberX", "NumberY", "NumberZ", "NumberPolar",
+)
+
+
+def FSIsBomObject(obj):
+    return hasattr(FSBomCollector, "Add" + FSRemoveDigits(obj.Name))
+
+
+class FSLiveBomDocument:
+    """Running BOM of a document. The contribution of every fastener is kept,
+    so a change only re-evaluates the fasteners it affects"""
+
+    def __init__(self, doc, sheet):
+        self.doc = doc
+        self.sheetName = sheet.Name
+        self.bom = {}  # description -> [qty, number of objects]
+        self.entries = {}  # object name -> {description: qty}
+        self.pending = set(obj.Name for obj in doc.Objects if FSIsBomObject(obj))
+        self.dirty = False
+        self.Update()
+
+    def Remove(self, name):
+        for desc, cnt in self.entries.pop(name, {}).items():
+            item = self.bom[desc]
+            item[0] -= cnt
+            item[1] -= 1
+            if item[1] == 0:
+                del self.bom[desc]
+            self.dirty = True
+
+    def Update(self):
+        for name in self.pending:
+            self.Remove(name)
+            obj = self.doc.getObject(name)
+            if obj is None:
+                continue
+            collector = FSBomCollector()
+            collector.AddObject(obj)
+            self.entries[name] = collector.fastenerDB
+            for desc, cnt in collector.fastenerDB.items():
+                item = self.bom.setdefault(desc, [0, 0])
+                item[0] += cnt
+                item[1] += 1
+                self.dirty = True
+        self.pending.clear()
+
+    def GetBom(self):
+        return {desc: item[0] for desc, item in self.bom.items()}
+
+
+class FSLiveBomObserver:
+    """Document observer keeping the BOM sheets of the tracked documents
+    up to date. The sheets are rewritten after each recompute if needed"""
+
+    def __init__(self):
+        self.docs = {}
+
+    def slotCreatedObject(self, obj):
+        live = self.docs.get(obj.Document.Name)
+        if live is not None and FSIsBomObject(obj):
+            live.pending.add(obj.Name)
+
+    def slotDeletedObject(self, obj):
+        live = self.docs.get(obj.Document.Name)
+        if live is None:
+            return
+        if FSIsBomObject(obj):
+            live.pending.discard(obj.Name)
+            live.Remove(obj.Name)
+        else:
+            self.AddChildren(live, obj)
+
+    def slotChangedObject(self, obj, prop):
+        live = self.docs.get(obj.Document.Name)
+        if live is None:
+            return
+        if FSIsBomObject(obj):
+            if prop in FSBomProperties:
+                live.pending.add(obj.Name)
+        elif prop in FSBomContainerProperties or prop == "Visibility":
+            self.AddChildren(live, obj)
+
+    def slotRecomputedDocument(self, doc):
+        live = self.docs.get(doc.Name)
+        if live is None:
+            return
+        live.Update()
+        if not live.dirty:
+            return
+        sheet = doc.getObject(live.sheetName)
+        if sheet is None:
+            # the BOM sheet was deleted, stop tracking
+            del self.docs[doc.Name]
+            return
+        FSWriteBom(live.GetBom(), FSBomSheetWriter(doc, sheet))
+        live.dirty = False
+
+    def slotDeletedDocument(self, doc):
+        self.docs.pop(doc.Name, None)
+
+    def AddChildren(self, live, obj):
+        for child in obj.OutListRecursive:
+            if FSIsBomObject(child):
+                live.pending.add(child.Name)
+
+
+FSLiveBom = None
+
+
+def FSStartLiveBom(doc, sheet):
+    """Keep the BOM in the given sheet updated while the document changes"""
+    global FSLiveBom
+    if FSLiveBom is None:
+        FSLiveBom = FSLiveBomObserver()
+        FreeCAD.addDocumentObserver(FSLiveBom)
+    FSLiveBom.docs[doc.Name] = FSLiveBomDocument(doc, sheet)
+
+
+def FSStopLiveBom(doc=None):
+    """Stop the live BOM of doc, or of all documents if doc is None. The
+    observer is removed when no document is tracked anymore"""
+    global FSLiveBom
+    if FSLiveBom is None:
+        return
+    if doc is None:
+        FSLiveBom.docs.clear()
+    else:
+        FSLiveBom.docs.pop(doc.Name, None)
+    if not FSLiveBom.docs:
+        FreeCAD.removeDocumentObserver(FSLiveBom)
+        FSLiveBom = None
+
+
+def FSUpdateLiveBom(doc, sheet):
+    """Start or stop live BOM updates of doc according to the preferences"""
+    if FSParam.GetBool("LiveBom", False):
+        FSStartLiveBom(doc, sheet)
+    else:
+        FSStopLiveBom(doc)
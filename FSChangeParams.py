@@ -149,30 +149,72 @@ def FSCPGetLengths(type, item, diam):
     return []
 
 
+# diameter list and set of every fastener type
+FSCPDiametersCache = {}
+
+
+def FSCPGetTypeDiameters(type):
+    if type not in FSCPDiametersCache:
+        diams = screwMaker.GetAllDiams(type)
+        FSCPDiametersCache[type] = (diams, set(diams))
+    return FSCPDiametersCache[type]
+
+
 def FSCPGetDiametersFromSelection(sel):
+    """Return the diameters available for all fastener types in the selection"""
     try:
-        if len(sel) == 0:
+        # distinct types, in selection order
+        listTypes = list(dict.fromkeys(obj.Type for obj in sel))
+        if len(listTypes) == 0:
             return []
-        obj0 = sel[0]
-        listDiams = screwMaker.GetAllDiams(obj0.Type)
-        if len(sel) == 1:
-            return listDiams
-        listTypes = [obj0.Type]
-        for obj in sel:
-            if obj.Type in listTypes:
-                continue
-            listTypes.append(obj.Type)
-            tmpList = listDiams
-            listDiams = []
-            for diam in screwMaker.GetAllDiams(obj.Type):
-                if diam in tmpList:
-                    listDiams.append(diam)
+        listDiams = FSCPGetTypeDiameters(listTypes[0])[0]
+        for type in listTypes[1:]:
+            diamSet = FSCPGetTypeDiameters(type)[1]
+            listDiams = [diam for diam in listDiams if diam in diamSet]
         return listDiams
     except:
         FSShowError()
         return []
 
 
+class FSCPSelectionSummary:
+    """Keep the fastener type shared by all selected objects. It is computed
+    once per selection change, so the command state can be polled cheaply"""
+
+    def __init__(self):
+        self.fstype = None
+        self.valid = False
+
+    def GetType(self):
+        """Return the fastener type of the selection, or None if the selection
+        is empty or holds different kinds of objects"""
+        if not self.valid:
+            self.fstype = None
+            names = set(FSRemoveDigits(obj.Name) for obj in Gui.Selection.getSelection())
+            if len(names) == 1:
+                name = names.pop()
+                if name in FSFastenerTypeDB:
+                    self.fstype = name
+            self.valid = True
+        return self.fstype
+
+    def addSelection(self, doc, obj, sub, pnt):
+        self.valid = False
+
+    def removeSelection(self, doc, obj, sub):
+        self.valid = False
+
+    def setSelection(self, doc):
+        self.valid = False
+
+    def clearSelection(self, doc):
+        self.valid = False
+
+
+FSCPSelection = FSCPSelectionSummary()
+Gui.Selection.addObserver(FSCPSelection)
+
+
 class FSCPSelectionFilter:
     ''' Disable selection changes '''
 
@@ -359,35 +401,57 @@ class FSTaskChangeParamDialog:
 
     def accept(self):
         ui = self.form.ui
+        doc = FreeCAD.ActiveDocument
+        # all objects are changed in one transaction with a single recompute.
+        # Fixed lengths are resolved by the fasteners on execute, after their
+        # type and diameter, and equal fasteners share the cached shape.
+        doc.openTransaction("Change fastener parameters")
         try:
-            # apply type and diameter
+            newType = None
+            if ui.comboFastenerType.isEnabled() and ui.comboFastenerType.currentIndex() > 0:
+                newType = str(ui.comboFastenerType.currentText())
+            newDiam = None
+            if ui.checkAutoDiameter.isChecked():
+                newDiam = 'Auto'
+            elif ui.comboDiameter.currentIndex() > 0:
+                newDiam = str(ui.comboDiameter.currentText())
+            newLength = None
+            arbitraryLength = False
+            if self.fstype.hasLength:
+                if self.fixedLength:
+                    if ui.comboLength.currentIndex() > 0:
+                        newLength = str(ui.comboLength.currentText())
+                elif ui.checkSetLength.isChecked():
+                    newLength = ui.spinLength.value()
+                    arbitraryLength = not self.fstype.lengthFixed
+
             for obj in self.selection:
-                if ui.comboFastenerType.isEnabled() and ui.comboFastenerType.currentIndex() > 0:
-                    obj.Type = str(ui.comboFastenerType.currentText())
-                if ui.checkAutoDiameter.isChecked():
+                # apply type and diameter
+                if newType is not None:
+                    obj.Type = newType
+                if newDiam == 'Auto':
                     if self.hatMatchOption and ui.comboMatchType.currentIndex() > 0:
                         obj.Proxy.VerifyCreateMatchOuter(obj)
                         obj.MatchOuter = ui.comboMatchType.currentIndex() == 2
                     obj.Diameter = 'Auto'
-                elif ui.comboDiameter.currentIndex() > 0:
-                    obj.Diameter = str(ui.comboDiameter.currentText())
-            FreeCAD.ActiveDocument.recompute()
-
-            # apply length
-            for obj in self.selection:
-                if self.fstype.hasLength:
-                    if self.fixedLength:
-                        obj.Length = str(ui.comboLength.currentText())
-                    else:
-                        if ui.checkSetLength.isChecked():
-                            if not self.fstype.lengthFixed:
-                                obj.Length = ui.spinLength.value()
-                            else:
-                                d, l, w = screwMaker.FindClosest(
-                                    obj.Type, obj.Diameter, ui.spinLength.value())
-                                obj.Length = l
-            FreeCAD.ActiveDocument.recompute()
+                elif newDiam is not None:
+                    diams = obj.getEnumerationsOfProperty("Diameter")
+                    if newDiam not in diams:
+                        # diameter of the new type, the list is updated on execute
+                        obj.Diameter = diams + [newDiam]
+                    obj.Diameter = newDiam
+
+                # apply length
+                if newLength is None:
+                    continue
+                if arbitraryLength:
+                    obj.Length = newLength
+                else:
+                    obj.Proxy.RequestLength(obj, newLength)
+            doc.recompute()
+            doc.commitTransaction()
         except:
+            doc.abortTransaction()
             FSShowError()
         self.DialogClosing()
         return True
@@ -424,21 +488,8 @@ class FSChangeParamCommand:
         return
 
     def IsActive(self):
-        sel = Gui.Selection.getSelection()
-        if len(sel) == 0:
-            return False
-        self.Type = None
-        tmaxlen = 0
-        for typename in FSFastenerTypeDB:
-            # FreeCAD.Console.PrintLog(typename + "\n")
-            if FSRemoveDigits(sel[0].Name) == typename:
-                self.Type = typename
-        if self.Type is None:
-            return False
-        for obj in sel:
-            if FSRemoveDigits(obj.Name) != self.Type:
-                return False
-        return True
+        self.Type = FSCPSelection.GetType()
+        return self.Type is not None
 
 
 Gui.addCommand("Fasteners_ChangeParameters", FSChangeParamCommand())
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   Copyright (c) 2026 - FreeCAD FastenersWB Authors                      *
+*                                                                         *
+*   This file is a supplement to the FreeCAD CAx development system.      *
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+*   as published by the Free Software Foundation; either version 2 of     *
+*   the License, or (at your option) any later version.                   *
+*   for detail see the LICENCE text file.                                 *
+*                                                                         *
+*   This software is distributed in the hope that it will be useful,      *
+*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+*   GNU Library General Public License for more details.                  *
+*                                                                         *
+*   You should have received a copy of the GNU Library General Public     *
+*   License along with this macro; if not, write to the Free Software     *
+*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+*   USA                                                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+# Background generation of threaded fasteners. While a job runs in a
+# FreeCADCmd process (see FSThreadWorker.py) the fastener shows its
+# unthreaded shape. When the job is done the threaded shape is added to the
+# shape cache and the waiting fasteners are recomputed to pick it up.
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+from PySide import QtCore
+import FreeCAD
+import Part
+import FastenerBase
+from FastenerBase import FSParam
+import ScrewMaker
+
+screwMaker = ScrewMaker.Instance
+
+_dir = os.path.dirname(__file__)
+
+# screw maker settings passed to the worker. The worker can not read them from
+# the user parameters, as these are not saved until FreeCAD exits
+FSWorkerSettings = ["sm3DPrintMode", "smNutThrScaleA", "smNutThrScaleB", "smScrewThrScaleA", "smScrewThrScaleB",
+                    "smCosmeticKnurl", "smThreadQuality", "smRingThreads"]
+
+
+def FSGetWorkerSettings():
+    return {name: getattr(screwMaker, name) for name in FSWorkerSettings}
+
+
+def FSFindFreeCADCmd():
+    names = ["FreeCADCmd", "freecadcmd"]
+    ext = ".exe" if sys.platform == "win32" else ""
+    bindir = os.path.join(FreeCAD.getHomePath(), "bin")
+    for name in names:
+        path = os.path.join(bindir, name + ext)
+        if os.path.isfile(path):
+            return path
+    for name in names:
+        path = shutil.which(name)
+        if path is not None:
+            return path
+    return None
+
+
+class FSThreadJob:
+    """Generation of one fastener shape (cache key) in a worker process"""
+
+    def __init__(self, manager, key, attribs):
+        self.manager = manager
+        self.key = key
+        self.canceled = False
+        self.dir = tempfile.mkdtemp(prefix="fasteners")
+        self.jobfile = os.path.join(self.dir, "job.json")
+        self.output = os.path.join(self.dir, "shape.brep")
+        self.result = os.path.join(self.dir, "result.json")
+        self.settings = FSGetWorkerSettings()
+        job = {
+            "attribs": attribs,
+            "settings": self.settings,
+            "output": self.output,
+            "result": self.result,
+        }
+        with open(self.jobfile, "w") as f:
+            json.dump(job, f)
+        self.process = None
+
+    def Start(self, command):
+        self.process = QtCore.QProcess()
+        env = QtCore.QProcessEnvironment.systemEnvironment()
+        env.insert("FS_THREAD_JOB", self.jobfile)
+        env.insert("FS_MOD_DIR", _dir)
+        self.process.setProcessEnvironment(env)
+        self.process.finished.connect(self.onFinished)
+        self.process.start(command, [os.path.join(_dir, "FSThreadWorker.py")])
+        self.process.closeWriteChannel()
+
+    def Cancel(self):
+        self.canceled = True
+        if self.process is not None:
+            # the process is kept until it has finished, Qt must not
+            # destroy it while it is running
+            self.manager.canceled.add(self)
+            self.process.kill()
+        else:
+            self.Cleanup()
+
+    def onFinished(self, exitCode, exitStatus):
+        self.process.deleteLater()
+        if self.canceled:
+            self.Cleanup()
+            self.manager.canceled.discard(self)
+            return
+        self.manager.JobFinished(self, exitCode == 0 and exitStatus == QtCore.QProcess.NormalExit)
+
+    def ReadShape(self):
+        if not os.path.isfile(self.output):
+            return None, []
+        shape = Part.Shape()
+        shape.importBrep(self.output)
+        tags = []
+        if os.path.isfile(self.result):
+            with open(self.result) as f:
+                tags = json.load(f)["tags"]
+        return shape, tags
+
+    def Cleanup(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+class FSThreadJobManager:
+    """Keeps track of the running jobs and of the fasteners waiting for them"""
+
+    def __init__(self):
+        self.jobs = {}  # cache key -> job
+        self.queue = []  # jobs not started yet
+        self.running = 0
+        self.waiting = {}  # (document name, object name) -> cache key
+        self.failed = set()  # keys that have to be generated synchronously
+        self.canceled = set()  # killed jobs whose process did not finish yet
+        self.command = None
+        self.commandSearched = False
+
+    def GetCommand(self):
+        if not self.commandSearched:
+            self.command = FSFindFreeCADCmd()
+            self.commandSearched = True
+            if self.command is None:
+                FreeCAD.Console.PrintWarning("FreeCADCmd not found, threads are generated in the foreground\n")
+        return self.command
+
+    def CanSubmit(self, key):
+        return (
+            FSParam.GetBool("AsyncThreadGeneration", False)
+            and key not in self.failed
+            and self.GetCommand() is not None
+        )
+
+    def Submit(self, obj, key, attribs):
+        """Generate the shape of obj with the given cache key in the background"""
+        self.waiting[(obj.Document.Name, obj.Name)] = key
+        if key in self.jobs:
+            return
+        job = FSThreadJob(self, key, attribs)
+        self.jobs[key] = job
+        self.queue.append(job)
+        FreeCAD.Console.PrintLog("Queued thread generation for: " + key + "\n")
+        self.StartJobs()
+
+    def StartJobs(self):
+        maxJobs = max(1, FSParam.GetInt("AsyncThreadJobs", os.cpu_count() or 2))
+        while self.queue and self.running < maxJobs:
+            self.queue.pop(0).Start(self.command)
+            self.running += 1
+
+    def Release(self, obj, key=None):
+        """Stop waiting for the background shape of obj, unless it is the one
+        with the given key. The job is canceled if no other fastener needs it"""
+        objkey = (obj.Document.Name, obj.Name)
+        oldkey = self.waiting.get(objkey)
+        if oldkey is None or oldkey == key:
+            return
+        del self.waiting[objkey]
+        if oldkey in self.waiting.values():
+            return
+        job = self.jobs.pop(oldkey, None)
+        if job is None:
+            return
+        FreeCAD.Console.PrintLog("Canceled thread generation for: " + oldkey + "\n")
+        if job in self.queue:
+            self.queue.remove(job)
+            job.Cancel()
+        else:
+            job.Cancel()
+            self.running -= 1
+            self.StartJobs()
+
+    def JobFinished(self, job, success):
+        self.jobs.pop(job.key, None)
+        self.running -= 1
+        shape, tags = job.ReadShape() if success else (None, [])
+        job.Cleanup()
+        if job.settings != FSGetWorkerSettings():
+            # the settings changed while the job was running, the shape is
+            # outdated. The waiting fasteners submit a new job on recompute
+            FreeCAD.Console.PrintLog("Discarded outdated thread generation for: " + job.key + "\n")
+        elif shape is None or shape.isNull():
+            FreeCAD.Console.PrintWarning("Background thread generation failed for: " + job.key + "\n")
+            self.failed.add(job.key)
+        else:
+            FastenerBase.FSCache[job.key] = shape
+            if tags:
+                FastenerBase.FSCacheTags[job.key] = set(tags)
+        self.StartJobs()
+
+        # recompute the fasteners still waiting for this shape
+        docs = []
+        for objkey, key in list(self.waiting.items()):
+            if key != job.key:
+                continue
+            del self.waiting[objkey]
+            doc = FreeCAD.listDocuments().get(objkey[0])
+            obj = doc.getObject(objkey[1]) if doc is not None else None
+            if obj is None:
+                continue
+            obj.touch()
+            if doc not in docs:
+                docs.append(doc)
+        for doc in docs:
+            doc.recompute()
+
+
+Manager = FSThreadJobManager()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+*   Copyright (c) 2026 - FreeCAD FastenersWB Authors                      *
+*                                                                         *
+*   This file is a supplement to the FreeCAD CAx development system.      *
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+*   as published by the Free Software Foundation; either version 2 of     *
+*   the License, or (at your option) any later version.                   *
+*   for detail see the LICENCE text file.                                 *
+*                                                                         *
+*   This software is distributed in the hope that it will be useful,      *
+*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+*   GNU Library General Public License for more details.                  *
+*                                                                         *
+*   You should have received a copy of the GNU Library General Public     *
+*   License along with this macro; if not, write to the Free Software     *
+*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+*   USA                                                                   *
+*                                                                         *
+***************************************************************************
+"""
+
+# Generates one fastener shape in a separate FreeCADCmd process, started by
+# FSThreadJobs. The job file is passed in the FS_THREAD_JOB environment
+# variable, the workbench directory in FS_MOD_DIR.
+
+import os
+import sys
+import json
+
+sys.path.insert(0, os.environ["FS_MOD_DIR"])
+
+import ScrewMaker
+
+
+class FSWorkerAttribs:
+    """Holds the fastener attributes of the job, like the fastener proxy does"""
+
+    pass
+
+
+def FSRunJob(jobfile):
+    with open(jobfile) as f:
+        job = json.load(f)
+    screwMaker = ScrewMaker.Instance
+    for name, value in job["settings"].items():
+        setattr(screwMaker, name, value)
+    fa = FSWorkerAttribs()
+    fa.__dict__.update(job["attribs"])
+    shape = screwMaker.createFastener(fa)
+    shape.exportBrep(job["output"])
+    with open(job["result"], "w") as f:
+        json.dump({"tags": sorted(screwMaker.scaledThreads)}, f)
+
+
+FSRunJob(os.environ["FS_THREAD_JOB"])
@@ -26,6 +26,10 @@
 
 import os
 import csv
+import json
+import math
+import bisect
+import itertools
 
 _dir = os.path.dirname(__file__)
 iconPath = os.path.join(_dir, "Icons")
@@ -80,3 +84,118 @@ def csv2dict(filename, defaultTableName, fieldsnamed=True):
                     continue
             cur_table[key] = data
         return tables
+
+
+# offsets of a grid cell and all its neighbours in (x, y, z, radius) space
+FSNeighbourCells = sorted(itertools.product((-1, 0, 1), repeat=4), key=lambda c: c.count(0), reverse=True)
+
+
+class FSPositionIndex:
+    """Set of already processed edge positions (center and radius).
+    Positions are hashed on a grid with the size of the tolerance, so a lookup
+    only checks the neighbouring cells instead of all previous positions.
+    Centers can be any points with x, y and z, like FreeCAD vectors.
+    """
+
+    def __init__(self, tol=1e-6):
+        self.tol = tol
+        self.cells = {}
+
+    def _cell(self, center, radius):
+        t = self.tol
+        return (round(center.x / t), round(center.y / t), round(center.z / t), round(radius / t))
+
+    def add(self, center, radius):
+        self.cells.setdefault(self._cell(center, radius), []).append(((center.x, center.y, center.z), radius))
+
+    def contains(self, center, radius):
+        cx, cy, cz, cr = self._cell(center, radius)
+        pt = (center.x, center.y, center.z)
+        for dx, dy, dz, dr in FSNeighbourCells:
+            for itm in self.cells.get((cx + dx, cy + dy, cz + dz, cr + dr), ()):
+                if math.dist(pt, itm[0]) <= self.tol and math.isclose(radius, itm[1], abs_tol=self.tol):
+                    return True
+        return False
+
+
+class FSSortedDiameters:
+    """Diameters of a table sorted for binary search.
+    diameters: (diameter, name) pairs in table order"""
+
+    def __init__(self, diameters):
+        # equal diameters stay in table order
+        items = sorted((dia, i, name) for i, (dia, name) in enumerate(diameters))
+        self.dias = [itm[0] for itm in items]
+        self.names = [itm[2] for itm in items]
+
+    def Find(self, d):
+        """Return the name of the smallest diameter above d, if it is less than
+        10 larger, otherwise M5"""
+        i = bisect.bisect_right(self.dias, d)  # smallest diameter above d
+        if i < len(self.dias) and self.dias[i] - d < 10.0:
+            return self.names[i]
+        return "M5"
+
+
+# BOM writers that do not need FreeCAD, see FSBom.py
+
+
+class FSBomWriter:
+    """Base class of the BOM backends. The lines are passed one by one to
+    WriteLine, so file writers can stream them out"""
+
+    def Begin(self):
+        pass
+
+    def WriteLine(self, fastener, qty):
+        raise NotImplementedError
+
+    def End(self):
+        pass
+
+
+class FSBomCsvWriter(FSBomWriter):
+    """Write the BOM as csv into an open text stream"""
+
+    def __init__(self, stream, delimiter=","):
+        self.writer = csv.writer(stream, delimiter=delimiter)
+
+    def Begin(self):
+        self.writer.writerow(["Type", "Qty"])
+
+    def WriteLine(self, fastener, qty):
+        self.writer.writerow([fastener, qty])
+
+
+class FSBomJsonLinesWriter(FSBomWriter):
+    """Write the BOM as JSON Lines (one json object per fastener)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def WriteLine(self, fastener, qty):
+        self.stream.write(json.dumps({"type": fastener, "qty": qty}) + "\n")
+
+
+class FSBomJsonWriter(FSBomWriter):
+    """Write the BOM as a json array of {"type", "qty"} objects"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def Begin(self):
+        self.lines = []
+
+    def WriteLine(self, fastener, qty):
+        self.lines.append({"type": fastener, "qty": qty})
+
+    def End(self):
+        json.dump(self.lines, self.stream, indent=2)
+        self.stream.write("\n")
+
+
+def FSWriteBom(bom, writer):
+    writer.Begin()
+    for fastener in sorted(bom.keys()):
+        writer.WriteLine(fastener, bom[fastener])
+    writer.End()
@@ -23,21 +23,27 @@
 #
 ###############################################################################
 
-from FreeCAD import Gui
 from FreeCAD import Base
-from PySide import QtGui
 import FreeCAD
-import FreeCADGui
 import Part
 import os
 import math
 import sys
 from pathlib import Path
-import DraftVecUtils
+import numpy as np
 import re
 from FSutils import csv2dict
 from FSutils import iconPath
 from FSutils import fsdatapath
+from FSutils import FSPositionIndex
+from FSutils import FSSortedDiameters
+
+# the gui is not available when running from FreeCADCmd, in that case only
+# the geometry and BOM functions of the workbench can be used
+if FreeCAD.GuiUp:
+    from FreeCAD import Gui
+    from PySide import QtGui
+    import FreeCADGui
 
 translate = FreeCAD.Qt.translate
 
@@ -273,12 +279,26 @@ def FSGetKey(*args):
     return (key, None)
 
 
+# tags of cached shapes that depend on settings, e.g. the 3D printing thread
+# scaling they were generated with ("NutScale", "ScrewScale")
+FSCacheTags = {}
+
+
 # removes all cached fasteners with real thread
 def FSCacheRemoveThreaded():
     for key in list(FSCache.keys()):
         if key.find("Thread:True") > 0:
             FreeCAD.Console.PrintLog("Removing cached shape: " + key + "\n")
             del FSCache[key]
+            FSCacheTags.pop(key, None)
+
+
+# removes all cached fasteners with the given tag
+def FSCacheRemoveTagged(tag):
+    for key in [k for k, tags in FSCacheTags.items() if tag in tags]:
+        FreeCAD.Console.PrintLog("Removing cached shape: " + key + "\n")
+        FSCache.pop(key, None)
+        del FSCacheTags[key]
 
 
 # extruct the diameter code (metric/imperial) from the given string
@@ -342,7 +362,13 @@ def FSRemoveDigits(txt):
 
 
 # get total count of a selected object taking arrays/links into account
-def GetTotalObjectRepeats(obj):
+# cache: optional dict shared between calls, it stores the count of every
+# visited object so common containers are only evaluated once
+def GetTotalObjectRepeats(obj, cache=None):
+    if cache is not None:
+        key = (obj.Document.Name, obj.Name)
+        if key in cache:
+            return cache[key]
     cnt = 1 if obj.Visibility else 0
 
     for parent in obj.InList:
@@ -386,10 +412,12 @@ def GetTotalObjectRepeats(obj):
             # non-Link circular arrays are not handled.
 
         if numreps != 0:
-            parentreps = GetTotalObjectRepeats(parent)
+            parentreps = GetTotalObjectRepeats(parent, cache)
             # print('Parent:' + parent.Name + '/' + parent.TypeId + ', Reps:' + str(parentreps))
             cnt += numreps * parentreps
 
+    if cache is not None:
+        cache[key] = cnt
     return cnt
 
 
@@ -397,10 +425,15 @@ class FSFaceMaker:
     """
     A class for creating faces point by point on the x,z plane
 
+    The points and arcs are collected as plain values, the edges are only
+    created when the wire is requested. Runs of straight lines become a single
+    polygon.
+
     Attributes:
-    edges (list): A list of edges defining the shape of the face.
-    firstPoint (FreeCAD.Base.Vector or None): The first point of the face.
-    lastPoint (FreeCAD.Base.Vector): The last point added to the face.
+    segments (list): ("line", points), ("arc", start, middle, end) and
+                     ("bspline", points) records, points are (x, z) tuples.
+    firstPoint (tuple or None): The first point of the face.
+    lastPoint (tuple or None): The last point added to the face.
     """
 
     def __init__(self):
@@ -409,35 +442,37 @@ class FSFaceMaker:
 
     def Reset(self):
         """
-        Resets the state of the FSFaceMaker by clearing edges
+        Resets the state of the FSFaceMaker by clearing segments
         and resetting firstPoint.
         """
-        self.edges = []
+        self.segments = []
         self.firstPoint = None
+        self.lastPoint = None
+
+    def AddLine(self, pt):
+        """Adds a line from the last point to pt, extending the current straight run."""
+        if self.segments and self.segments[-1][0] == "line":
+            self.segments[-1][1].append(pt)
+        else:
+            self.segments.append(("line", [self.lastPoint, pt]))
+        self.lastPoint = pt
 
     def AddPoint(self, x, z):
         """
         Adds a point (x, z) to the face, creating a line
         from the last point to the new point.
         """
-        curPoint = FreeCAD.Base.Vector(x, 0, z)
         if self.firstPoint is None:
-            self.firstPoint = curPoint
+            self.firstPoint = self.lastPoint = (x, z)
         else:
-            self.edges.append(Part.makeLine(self.lastPoint, curPoint))
-        self.lastPoint = curPoint
-        # FreeCAD.Console.PrintLog("Add Point: " + str(curPoint) + "\n")
+            self.AddLine((x, z))
 
     def AddPointRelative(self, dx, dz):
         """Adds a point relative to the last point, creating a line."""
         if self.firstPoint is None:
             FreeCAD.Console.PrintError("FSFaceMaker.AddPointRelative: A start point has to be set previous")
             return
-        else:
-            curPoint = self.lastPoint + FreeCAD.Base.Vector(dx, 0, dz)
-            self.edges.append(Part.makeLine(self.lastPoint, curPoint))
-            self.lastPoint = curPoint
-        # FreeCAD.Console.PrintLog("Add Point Rel: " + str(curPoint) + "\n")
+        self.AddLine((self.lastPoint[0] + dx, self.lastPoint[1] + dz))
 
     def StartPoint(self, x, z):
         """Resets the state and sets the starting point for the face."""
@@ -446,33 +481,22 @@ class FSFaceMaker:
 
     def AddArc(self, x1, z1, x2, z2):
         """Adds an arc from the last point through (x1, z1) to (x2, z2)."""
-        midPoint = FreeCAD.Base.Vector(x1, 0, z1)
-        endPoint = FreeCAD.Base.Vector(x2, 0, z2)
-        self.edges.append(Part.Arc(self.lastPoint, midPoint, endPoint).toShape())
-        self.lastPoint = endPoint
+        self.segments.append(("arc", self.lastPoint, (x1, z1), (x2, z2)))
+        self.lastPoint = (x2, z2)
 
     def AddArc2(self, xc, zc, a):
         """Adds an arc starting at last point, with a relative center and angle a."""
-        # convert to radians
         a = math.radians(a)
-        # get absolute center
-        xac = self.lastPoint.x + xc
-        zac = self.lastPoint.z + zc
-        # start angle
+        # absolute center
+        xac = self.lastPoint[0] + xc
+        zac = self.lastPoint[1] + zc
+        r = math.hypot(xc, zc)
+        # angles of the middle and end points
         sa = math.atan2(-zc, -xc)
-        # radius
-        r = math.sqrt(xc * xc + zc * zc)
-        # middle point
-        sa += a / 2.0
-        # FreeCAD.Console.PrintLog("ang1: " + str(math.degrees(sa)) + "\n")
-        x1 = xac + r * math.cos(sa)
-        z1 = zac + r * math.sin(sa)
-        # end point
-        sa += a / 2.0
-        # FreeCAD.Console.PrintLog("ang2: " + str(math.degrees(sa)) + "\n")
-        x2 = xac + r * math.cos(sa)
-        z2 = zac + r * math.sin(sa)
-        self.AddArc(x1, z1, x2, z2)
+        ma = sa + a / 2.0
+        ea = sa + a
+        self.AddArc(xac + r * math.cos(ma), zac + r * math.sin(ma),
+                    xac + r * math.cos(ea), zac + r * math.sin(ea))
 
     def AddBSpline(self, *args):
         """
@@ -484,14 +508,9 @@ class FSFaceMaker:
         if l < 4 or (l & 1) == 1:
             FreeCAD.Console.PrintError("FSFaceMaker.AddBSpline: invalid num of args, must be even number >= 4")
             return
-        pt = self.lastPoint
-        pts = []
-        pts.append(pt)
-        for i in range(0, l, 2):
-            pt = FreeCAD.Base.Vector(args[i], 0, args[i + 1])
-            pts.append(pt)
-        self.edges.append(Part.BSplineCurve(pts).toShape())
-        self.lastPoint = pt
+        pts = [self.lastPoint] + [(args[i], args[i + 1]) for i in range(0, l, 2)]
+        self.segments.append(("bspline", pts))
+        self.lastPoint = pts[-1]
 
     def AddPoints(self, *args):
         """Adds points or arcs based on the number of arguments provided."""
@@ -503,23 +522,44 @@ class FSFaceMaker:
             elif len(arg) == 4:
                 self.AddArc(arg[0], arg[1], arg[2], arg[3])
 
+    def GetSegments(self, closed):
+        """Returns the segments, with a closing line to the first point if closed is set."""
+        segments = list(self.segments)
+        if closed:
+            if segments and segments[-1][0] == "line":
+                segments[-1] = ("line", segments[-1][1] + [self.firstPoint])
+            else:
+                segments.append(("line", [self.lastPoint, self.firstPoint]))
+        return segments
+
+    def MakeWire(self, segments) -> Part.Wire:
+        def vec(pt):
+            return FreeCAD.Base.Vector(pt[0], 0, pt[1])
+
+        edges = []
+        for seg in segments:
+            if seg[0] == "line":
+                edges.extend(Part.makePolygon([vec(pt) for pt in seg[1]]).Edges)
+            elif seg[0] == "arc":
+                edges.append(Part.Arc(vec(seg[1]), vec(seg[2]), vec(seg[3])).toShape())
+            else:
+                edges.append(Part.BSplineCurve([vec(pt) for pt in seg[1]]).toShape())
+        return Part.Wire(edges)
+
     def GetWire(self) -> Part.Wire:
         """Returns a Part.Wire object representing the edges of the face."""
-        return Part.Wire(self.edges)
+        return self.MakeWire(self.segments)
 
     def GetClosedWire(self) -> Part.Wire:
         """
         Returns a closed Part.Wire object by adding a line from the last point
         to the first point.
         """
-        self.edges.append(Part.makeLine(self.lastPoint, self.firstPoint))
-        w = Part.Wire(self.edges)
-        return w
+        return self.MakeWire(self.GetSegments(True))
 
     def GetFace(self) -> Part.Face:
         """Returns a Part.Face object representing the closed wire as a face."""
-        w = self.GetClosedWire()
-        return Part.Face(w)
+        return Part.Face(self.GetClosedWire())
 
 
 def FSAutoDiameterM(holeObj, table, tablepos):
@@ -540,6 +580,21 @@ def FSAutoDiameterM(holeObj, table, tablepos):
     return res
 
 
+class FSDiameterIndex(FSSortedDiameters):
+    """Diameters of a table sorted for binary search.
+    Find gives the same result as FSAutoDiameterM for a hole diameter"""
+
+    def __init__(self, table, tablepos):
+        diameters = []
+        for m in table:
+            if tablepos == -1:
+                dia = DiaStr2Num(m) + 0.1
+            else:
+                dia = table[m][tablepos] + 0.1
+            diameters.append((dia, m))
+        super().__init__(diameters)
+
+
 class FSViewProviderIcon:
     """A View provider for custom icon"""
 
@@ -594,15 +649,25 @@ def GetEdgeName(obj, edge):
     return None
 
 
-def PositionDone(center, radius, done_list, tol=1e-6):
-    """Check if the `position` of an edge is already processed by comparing
-    its center and radius against data in a list
+class FSEdgeIndex:
+    """Map the edges of a shape back to their "EdgeN" names.
+    Build it once per shape and use GetEdgeName instead of the module function
+    when many edges of the same shape need to be named.
     """
 
-    for itm in done_list:
-        if center.isEqual(itm[0], tol) and math.isclose(radius, itm[1], abs_tol=tol):
-            return True
-    return False
+    def __init__(self, shape):
+        self.Edges = shape.Edges
+        # edges are hashed on their underlying TShape and location,
+        # isSame confirms the match inside a bucket
+        self.buckets = {}
+        for i, e in enumerate(self.Edges):
+            self.buckets.setdefault(e.hashCode(), []).append((e, "Edge" + str(i + 1)))
+
+    def GetEdgeName(self, edge):
+        for e, name in self.buckets.get(edge.hashCode(), ()):
+            if e.isSame(edge):
+                return name
+        return None
 
 
 def FSGetAttachableSelections(screwObj=None):
@@ -613,8 +678,9 @@ def FSGetAttachableSelections(screwObj=None):
 
         baseObjectNames = selObj.SubElementNames
         obj = selObj.Object
-        position_done_list = []  # list with sublists to store the center and radius
-        # of processed edges to avoid duplicate fasteners
+        # center and radius of processed edges to avoid duplicate fasteners
+        positions_done = FSPositionIndex()
+        edge_index = None  # built on first use, shared by all faces of obj
 
         for baseObjectName in baseObjectNames:
             shape = obj.getSubObject(baseObjectName)
@@ -625,15 +691,18 @@ def FSGetAttachableSelections(screwObj=None):
                     continue
                 if not hasattr(shape.Curve, "Radius"):
                     continue
-                if PositionDone(shape.Curve.Center, shape.Curve.Radius, position_done_list):
+                if positions_done.contains(shape.Curve.Center, shape.Curve.Radius):
                     continue
                 asels.append((obj, [baseObjectName]))
-                position_done_list.append([shape.Curve.Center, shape.Curve.Radius])
+                positions_done.add(shape.Curve.Center, shape.Curve.Radius)
                 FreeCAD.Console.PrintLog("Linking to " + obj.Name + "[" + baseObjectName + "].\n")
 
             # add edges of selected faces
             elif isinstance(shape, Part.Face):
-                outer_edge_list = shape.OuterWire.Edges
+                # outer wire edges hashed by their underlying shape
+                outer_edges = {}
+                for outer_edge in shape.OuterWire.Edges:
+                    outer_edges.setdefault(outer_edge.hashCode(), []).append(outer_edge)
                 for edge in shape.Edges:
                     if not hasattr(edge, "Curve"):
                         continue
@@ -641,19 +710,17 @@ def FSGetAttachableSelections(screwObj=None):
                         continue
                     if not hasattr(edge.Curve, "Radius"):
                         continue
-                    if PositionDone(edge.Curve.Center, edge.Curve.Radius, position_done_list):
+                    if positions_done.contains(edge.Curve.Center, edge.Curve.Radius):
                         continue
-                    for outer_edge in outer_edge_list:
-                        if outer_edge.isSame(edge):
-                            edge = None
-                            break
-                    if edge is None:
+                    if any(outer_edge.isSame(edge) for outer_edge in outer_edges.get(edge.hashCode(), ())):
                         continue
-                    edgeName = GetEdgeName(obj.Shape, edge)
+                    if edge_index is None:
+                        edge_index = FSEdgeIndex(obj.Shape)
+                    edgeName = edge_index.GetEdgeName(edge)
                     if edgeName is None:
                         continue
                     asels.append((obj, [edgeName]))
-                    position_done_list.append([edge.Curve.Center, edge.Curve.Radius])
+                    positions_done.add(edge.Curve.Center, edge.Curve.Radius)
                     FreeCAD.Console.PrintLog("Linking to " + obj.Name + "[" + edgeName + "].\n")
 
     if len(asels) == 0:
@@ -661,10 +728,11 @@ def FSGetAttachableSelections(screwObj=None):
     return asels
 
 
-def FSMoveToObject(ScrewObj_m, attachToObject, invert, offset, offsetAngle):
+def FSGetAttachmentFrame(attachToObject):
+    """Return the (point, axis) of the hole or surface a fastener attaches to.
+    axis is None if the object can not be used for attachment"""
     Pnt1 = None
     Axis1 = None
-    Axis2 = None
     s = attachToObject
     if hasattr(s, "Curve"):
         if hasattr(s.Curve, "Center"):
@@ -679,45 +747,77 @@ def FSMoveToObject(ScrewObj_m, attachToObject, invert, offset, offsetAngle):
     if hasattr(s, "Point"):
         FreeCAD.Console.PrintLog("the object seems to be a vertex! " + str(s.Point) + "\n")
         Pnt1 = s.Point
+    return Pnt1, Axis1
+
+
+def FSComputePlacements(centers, axes, inverts, offsets, offsetAngles):
+    """Compute the placements of many attached fasteners at once.
+    centers, axes: sequences of vectors (or n x 3 arrays) of the attachment points
+    inverts, offsets, offsetAngles: per fastener values as in FSMoveToObject
+    (offset in mm along the axis, offsetAngle in degrees around it).
+    Return a list of FreeCAD.Placement"""
+    centers = np.array(centers, dtype=float).reshape(-1, 3)
+    axes = np.array(axes, dtype=float).reshape(-1, 3)
+    axes = axes * np.where(np.asarray(inverts, dtype=bool), -1.0, 1.0)[:, None]
+    positions = centers + axes * np.asarray(offsets, dtype=float)[:, None]
+
+    # rotation taking the fastener z axis to the attachment axis:
+    # around normvec = axis x z, by the angle between them
+    axes = axes / np.linalg.norm(axes, axis=1)[:, None]
+    normvec = np.cross(axes, (0.0, 0.0, 1.0))
+    normlen = np.linalg.norm(normvec, axis=1)
+    angle = np.arccos(np.clip(axes[:, 2], -1.0, 1.0))
+    parallel = normlen < 1e-12
+    normvec[parallel] = (1.0, 0.0, 0.0)
+    normlen[parallel] = 1.0
+    angle[parallel] = np.where(axes[parallel, 2] > 0.0, 0.0, math.pi)
+    qv = normvec * (-np.sin(angle / 2.0) / normlen)[:, None]  # quaternion elements
+    qw = np.cos(angle / 2.0)
+
+    # apply the rotation offset around the fastener z axis first
+    half = np.radians(np.asarray(offsetAngles, dtype=float)) / 2.0
+    sin_off = np.sin(half)
+    cos_off = np.cos(half)
+    rx = cos_off * qv[:, 0] + sin_off * qv[:, 1]
+    ry = cos_off * qv[:, 1] - sin_off * qv[:, 0]
+    rz = cos_off * qv[:, 2] + sin_off * qw
+    rw = cos_off * qw - sin_off * qv[:, 2]
+
+    return [
+        FreeCAD.Placement(Base.Vector(*pos), FreeCAD.Rotation(x, y, z, w))
+        for pos, x, y, z, w in zip(positions.tolist(), rx.tolist(), ry.tolist(), rz.tolist(), rw.tolist())
+    ]
+
+
+def FSMoveToObjects(ScrewObjs, attachToObjects, inverts, offsets, offsetAngles):
+    """Batch version of FSMoveToObject, all placements are computed in one pass.
+    Fasteners whose attachment object has no axis are left untouched"""
+    items = []
+    for i, attachToObject in enumerate(attachToObjects):
+        Pnt1, Axis1 = FSGetAttachmentFrame(attachToObject)
+        if Axis1 is not None:
+            items.append((i, Pnt1, Axis1))
+    if len(items) == 0:
+        return
+    placements = FSComputePlacements(
+        [itm[1] for itm in items],
+        [itm[2] for itm in items],
+        [inverts[itm[0]] for itm in items],
+        [offsets[itm[0]] for itm in items],
+        [offsetAngles[itm[0]] for itm in items],
+    )
+    for itm, pl in zip(items, placements):
+        ScrewObjs[itm[0]].Placement = pl
 
-    if Axis1 is not None:
-        if invert:
-            Axis1 = Base.Vector(0, 0, 0) - Axis1
-
-        Pnt1 = Pnt1 + Axis1 * offset
-        # FreeCAD.Console.PrintLog( "Got Axis1: " + str(Axis1) + "\n")
-        Axis2 = Base.Vector(0.0, 0.0, 1.0)
-        Axis2_minus = Base.Vector(0.0, 0.0, -1.0)
-
-        # Calculate angle
-        if Axis1 == Axis2:
-            normvec = Base.Vector(1.0, 0.0, 0.0)
-            result = 0.0
-        else:
-            if Axis1 == Axis2_minus:
-                normvec = Base.Vector(1.0, 0.0, 0.0)
-                result = math.pi
-            else:
-                # Calculate axis of rotation = normvec
-                normvec = Axis1.cross(Axis2)
-                normvec.normalize()  # Normalize for quaternion calculations
-                # normvec_rot = normvec
-                result = DraftVecUtils.angle(Axis1, Axis2, normvec)  # Angle calculation
-        sin_res = math.sin(result / 2.0)
-        cos_res = math.cos(result / 2.0)
-        normvec.multiply(-sin_res)  # Calculation of the quaternion elements
 
-        # FreeCAD.Console.PrintMessage( "Angle = "+ str(math.degrees(result)) + "\n")
-        # FreeCAD.Console.PrintMessage("Normal vector: "+ str(normvec) + "\n")
+def FSLocatedShape(shape, placement):
+    """Return shape moved to placement. The result shares the geometry of
+    shape, so many located copies of a fastener are cheap to build and store"""
+    return shape.transformed(placement.toMatrix())
 
-        pl = FreeCAD.Placement()
-        pl.Rotation = (normvec.x, normvec.y, normvec.z, cos_res)  # Rotation quaternion
 
-        # FreeCAD.Console.PrintMessage("pl mit Rot: "+ str(pl) + "\n")
-        ScrewObj_m.Placement = FreeCAD.Placement()
-        ScrewObj_m.Placement.rotate(Base.Vector(0, 0, 0), Base.Vector(0, 0, 1), offsetAngle)
-        ScrewObj_m.Placement.Rotation = pl.Rotation.multiply(ScrewObj_m.Placement.Rotation)
-        ScrewObj_m.Placement.move(Pnt1)
+def FSMoveToObject(ScrewObj_m, attachToObject, invert, offset, offsetAngle):
+    FSMoveToObjects([ScrewObj_m], [attachToObject], [invert], [offset], [offsetAngle])
 
 
 ###############################################################################
@@ -758,13 +858,14 @@ class FSFlipCommand:
             obj = selobj.Object
             # FreeCAD.Console.PrintLog("sel obj: " + str(obj) + "\n")
             if hasattr(obj, "Proxy") and isinstance(obj.Proxy, FSBaseObject):
-                if obj.BaseObject is not None:
+                if obj.BaseObject is not None or hasattr(obj, "Holes"):
                     screwObj.append(obj)
         return screwObj
 
 
-Gui.addCommand("Fasteners_Flip", FSFlipCommand())
-FSCommands.append("Fasteners_Flip", "command")
+if FreeCAD.GuiUp:
+    Gui.addCommand("Fasteners_Flip", FSFlipCommand())
+    FSCommands.append("Fasteners_Flip", "command")
 
 ################################ Move command #################################
 
@@ -807,8 +908,9 @@ class FSMoveCommand:
         return screwObj, edgeObj
 
 
-Gui.addCommand("Fasteners_Move", FSMoveCommand())
-FSCommands.append("Fasteners_Move", "command")
+if FreeCAD.GuiUp:
+    Gui.addCommand("Fasteners_Move", FSMoveCommand())
+    FSCommands.append("Fasteners_Move", "command")
 
 ########################### Make Simple command ###############################
 
@@ -842,8 +944,9 @@ class FSMakeSimpleCommand:
         return False
 
 
-Gui.addCommand("Fasteners_Simplify", FSMakeSimpleCommand())
-FSCommands.append("Fasteners_Simplify", "command")
+if FreeCAD.GuiUp:
+    Gui.addCommand("Fasteners_Simplify", FSMakeSimpleCommand())
+    FSCommands.append("Fasteners_Simplify", "command")
 
 ######################## MatchTypeInner/Outer commands ########################
 
@@ -889,10 +992,11 @@ class FSMatchTypeOuterCommand:
         }
 
 
-FreeCADGui.addCommand("Fasteners_MatchTypeInner", FSMatchTypeInnerCommand())
-FreeCADGui.addCommand("Fasteners_MatchTypeOuter", FSMatchTypeOuterCommand())
-FSCommands.append("Fasteners_MatchTypeInner", "command")
-FSCommands.append("Fasteners_MatchTypeOuter", "command")
+if FreeCAD.GuiUp:
+    FreeCADGui.addCommand("Fasteners_MatchTypeInner", FSMatchTypeInnerCommand())
+    FreeCADGui.addCommand("Fasteners_MatchTypeOuter", FSMatchTypeOuterCommand())
+    FSCommands.append("Fasteners_MatchTypeInner", "command")
+    FSCommands.append("Fasteners_MatchTypeOuter", "command")
 
 
 def InitCheckables():
@@ -923,94 +1027,18 @@ class FSMakeBomCommand:
         }
 
     def Activated(self):
-        self.fastenerDB = {}
-        sheet = FreeCAD.ActiveDocument.addObject("Spreadsheet::Sheet", "Fasteners_BOM")
-        sheet.Label = translate("FastenerBase", "Fasteners_BOM")
-        sheet.setColumnWidth("A", 300)
-        sheet.set("A1", translate("FastenerBase", "Type"))
-        sheet.set("B1", translate("FastenerBase", "Qty"))
-        for obj in FreeCAD.ActiveDocument.Objects:
-            name = FSRemoveDigits(obj.Name)
-            # get total count
-            cnt = GetTotalObjectRepeats(obj)
-            FreeCAD.Console.PrintLog("Using method: Add" + obj.Name + "\n")
-            method = getattr(self, "Add" + name, lambda x, y: "nothing")
-            method(obj, cnt)
-            # FreeCAD.Console.PrintLog('Add ' + str(cnt) + " " + obj.Name  + "\n")
-        line = 2
-        for fastener in sorted(self.fastenerDB.keys()):
-            sheet.set("A" + str(line), fastener)
-            sheet.set("B" + str(line), str(self.fastenerDB[fastener]))
-            line += 1
-        FreeCAD.ActiveDocument.recompute()
-        return
-
-    def AddFastener(self, fastener, cnt):
-        if fastener in self.fastenerDB:
-            self.fastenerDB[fastener] = self.fastenerDB[fastener] + cnt
-        else:
-            self.fastenerDB[fastener] = cnt
-
-    def AddScrew(self, obj, cnt):
-        desc = obj.Type + translate("FastenerBase", " Screw ") + FSScrewStr(obj)
-        self.AddFastener(desc, cnt)
-
-    def AddNut(self, obj, cnt):
-        if hasattr(obj, "Type"):
-            type = obj.Type
-        else:
-            type = "ISO4033"
-        self.AddFastener(type + translate("FastenerBase", " Nut ") + obj.Diameter, cnt)
-
-    def AddWasher(self, obj, cnt):
-        self.AddFastener(obj.Type + translate("FastenerBase", " Washer ") + obj.Diameter, cnt)
+        import FSBom
 
-    def AddThreadedRod(self, obj, cnt):
-        desc = translate("FastenerBase", "Threaded Rod ") + FSScrewStr(obj)
-        self.AddFastener(desc, cnt)
-
-    def AddPressNut(self, obj, cnt):
-        self.AddFastener(translate("FastenerBase", "PEM PressNut ") + obj.Diameter + "-" + obj.Tcode, cnt)
-
-    def AddStandoff(self, obj, cnt):
-        self.AddFastener(translate("FastenerBase", "PEM Standoff ") + obj.Diameter + "x" + obj.Length, cnt)
-
-    def AddStud(self, obj, cnt):
-        self.AddFastener(translate("FastenerBase", "PEM Stud ") + obj.Diameter + "x" + obj.Length, cnt)
-
-    def AddPcbStandoff(self, obj, cnt):
-        self.AddFastener(
-            translate("FastenerBase", "PCB Standoff ") + obj.Diameter + "x" + obj.Width + "x" + obj.Length, cnt
-        )
-
-    def AddHeatSet(self, obj, cnt):
-        self.AddFastener(translate("FastenerBase", "Heat Set Insert ") + obj.Diameter, cnt)
-
-    def AddRetainingRing(self, obj, cnt):
-        self.AddFastener(obj.Type + translate("FastenerBase", " Retaining Ring ") + obj.Diameter, cnt)
-
-    def AddTSlot(self, obj, cnt):
-        if obj.Type == "GN505.4":
-            self.AddFastener(
-                obj.Type + translate("FastenerBase", " T-Slot Bolt ") + obj.Diameter + " " + obj.SlotWidth, cnt
-            )
-        else:
-            self.AddFastener(
-                obj.Type + translate("FastenerBase", " T-Slot Nut ") + obj.Diameter + " " + obj.SlotWidth, cnt
-            )
-
-    def AddHexKey(self, obj, cnt):
-        self.AddFastener(obj.Type + translate("FastenerBase", " Hex key ") + obj.Diameter + "mm", cnt)
-
-    def AddNail(self, obj, cnt):
-        self.AddFastener(obj.Type + translate("FastenerBase", " Nail ") + obj.Diameter, cnt)
-
-    def AddPin(self, obj, cnt):
-        self.AddFastener(obj.Type + translate("Fastenerbase", " Pin ") + obj.Diameter + "x" + obj.Length, cnt)
+        doc = FreeCAD.ActiveDocument
+        writer = FSBom.FSBomSheetWriter(doc)
+        FSBom.FSWriteBom(FSBom.FSGetBom(doc), writer)
+        FSBom.FSUpdateLiveBom(doc, writer.sheet)
+        return
 
     def IsActive(self):
         return Gui.ActiveDocument is not None
 
 
-Gui.addCommand("Fasteners_BOM", FSMakeBomCommand())
-FSCommands.append("Fasteners_BOM", "command")
+if FreeCAD.GuiUp:
+    Gui.addCommand("Fasteners_BOM", FSMakeBomCommand())
+    FSCommands.append("Fasteners_BOM", "command")
@@ -25,12 +25,14 @@
 
 from FreeCAD import Gui
 import FreeCAD
+import Part
 import os
 import re
 import FastenerBase
 from FastenerBase import FSParam
 from FastenerBase import FSBaseObject
 import ScrewMaker
+import FSThreadJobs
 from FSutils import iconPath
 from FSAliases import FSGetIconAlias, FSGetTypeAlias
 
@@ -115,6 +117,13 @@ CMD_GROUP = 1
 CMD_PARAMETER_GRP = 2
 CMD_STD_GROUP = 3
 
+# Layout version of the fastener object properties. Increase it whenever
+# VerifyMissingAttrs, migrateToUpperCase or the updateProps of a fastener class
+# learns to add or migrate a property, so objects saved with an older layout
+# go through the full migration when restored. updateProps is still called for
+# up to date objects, as a safety net for property changes without a bump.
+FSObjectSchemaVersion = 1
+
 FSScrewCommandTable = {
     # type - (help, group, parameter-group, standard-group)
 
@@ -468,6 +477,10 @@ class FSScrewObject(FSBaseObject):
             val = getattr(self, attr)
             if val is not None:
                 key += attr + ":" + str(val) + "|"
+        if self.Thread:
+            # threads also depend on the thread settings
+            key += "Quality:" + str(screwMaker.smThreadQuality) + "|"
+            key += "Rings:" + str(screwMaker.smRingThreads) + "|"
         return key.rstrip("|")
 
     def VerifyMissingAttrs(self, obj, type=None):
@@ -594,6 +607,11 @@ class FSScrewObject(FSBaseObject):
                 "FastenerCmd", "Threaded part length")).ScrewLength = screwMaker.GetThreadLength(type, diameter)
 
         self.migrateToUpperCase(obj)
+        if not hasattr(obj, "SchemaVersion"):
+            obj.addProperty("App::PropertyInteger", "SchemaVersion", "Base", translate(
+                "FastenerCmd", "Fastener properties layout version"))
+            obj.setEditorMode("SchemaVersion", 2)
+        obj.SchemaVersion = FSObjectSchemaVersion
         self.BackupObject(obj)
         # for attr in FastenerAttribs:
         #     atval = getattr(self, attr)
@@ -611,8 +629,56 @@ class FSScrewObject(FSBaseObject):
         return types
 
     def onDocumentRestored(self, obj):
-        # for backward compatibility: add missing attribute if needed
-        self.VerifyMissingAttrs(obj)
+        if getattr(obj, "SchemaVersion", 0) >= FSObjectSchemaVersion:
+            # object is already up to date, just refresh the backup attribs
+            self.updateProps(obj)
+            self.InitBackupAttribs()
+            self.familyType = screwMaker.GetTypeName(obj.Type)
+            self.BackupObject(obj)
+        else:
+            # for backward compatibility: add missing attribute if needed
+            self.VerifyMissingAttrs(obj)
+        if FSParam.GetBool("TrustStoredShapes", False):
+            self.CacheStoredShape(obj)
+
+    def StoredShapeMatches(self, obj, shape):
+        """Cheap sanity check of a shape loaded from the document against
+        the nominal size of the fastener."""
+        if shape.isNull() or len(shape.Solids) == 0:
+            return False
+        bb = shape.BoundBox
+        if not bb.isValid():
+            return False
+        try:
+            dia = FastenerBase.DiaStr2Num(obj.Diameter)
+            if max(bb.XLength, bb.YLength) < 0.9 * dia:
+                return False
+        except Exception:
+            pass  # non standard diameter code, skip this check
+        if hasattr(obj, 'Length'):
+            length = FastenerBase.LenStr2Num(self.ActiveLength(obj))
+            if bb.ZLength < 0.99 * length:
+                return False
+        return True
+
+    def CacheStoredShape(self, obj):
+        """Register the shape saved in the document into the shape cache,
+        so the first recompute after loading does not regenerate it."""
+        (key, s) = FastenerBase.FSGetKey(self.GetKey())
+        if s is not None:
+            return
+        if getattr(obj, "ShapeKey", "") != self.GetShapeKey(key):
+            FreeCAD.Console.PrintLog("Stored shape of " + obj.Name + " was made with other settings, not cached\n")
+            return
+        shape = obj.Shape
+        # check and cache the shape in the fastener coordinate system
+        shape.Placement = FreeCAD.Placement()
+        if not self.StoredShapeMatches(obj, shape):
+            FreeCAD.Console.PrintLog("Stored shape of " + obj.Name + " does not match, not cached\n")
+            return
+        FastenerBase.FSCache[key] = shape
+        # unknown which settings the shape depends on, drop it when any changes
+        FastenerBase.FSCacheTags[key] = {"NutScale", "ScrewScale", "Knurl", "ThreadQuality", "ThreadRepresentation"}
 
     def CleanDecimals(self, val):
         val = str(val)
@@ -629,18 +695,77 @@ class FSScrewObject(FSBaseObject):
             return self.CleanDecimals(float(obj.LengthCustom))
         return obj.Length
 
+    def RequestLength(self, fp, length):
+        """Set the closest standard length to the given one on the next execute,
+        after type and diameter changes are resolved"""
+        self.requestedLength = str(length)
+        fp.touch()
+
+    def GenerateShape(self, key):
+        s = screwMaker.createFastener(self)
+        FastenerBase.FSCache[key] = s
+        if screwMaker.scaledThreads:
+            FastenerBase.FSCacheTags[key] = set(screwMaker.scaledThreads)
+        return s
+
+    def GenerateDeferred(self, fp, key):
+        """Return the unthreaded shape, the threaded one is generated in the
+        background and replaces it when ready"""
+        attribs = {}
+        for attr in FastenerAttribs + ['baseType', 'calc_diam', 'calc_len', 'calc_pitch']:
+            attribs[attr] = getattr(self, attr, None)
+        FSThreadJobs.Manager.Submit(fp, key, attribs)
+        self.Thread = False
+        try:
+            (ukey, s) = FastenerBase.FSGetKey(self.GetKey())
+            if s is None:
+                s = self.GenerateShape(ukey)
+        finally:
+            self.Thread = True
+        return s
+
+    def GetShapeKey(self, key):
+        """Return the cache key together with all screw maker settings, to
+        identify the shape stored in the document"""
+        settings = FSThreadJobs.FSGetWorkerSettings()
+        return key + "|" + "|".join(name + ":" + str(settings[name]) for name in FSThreadJobs.FSWorkerSettings)
+
+    def SetShapeKey(self, fp, shapeKey):
+        """Save the key of the shape of fp, a stored shape is only trusted on
+        load if it still matches. Unthreaded stand-ins get an empty key"""
+        if not hasattr(fp, "ShapeKey"):
+            fp.addProperty("App::PropertyString", "ShapeKey", "Base", translate(
+                "FastenerCmd", "Settings the shape was generated with"))
+            fp.setEditorMode("ShapeKey", 2)
+        if fp.ShapeKey != shapeKey:
+            fp.ShapeKey = shapeKey
+
     def paramChanged(self, param, value):
         return getattr(self, param) != value
 
-    def execute(self, fp):
-        """Print a short message when doing a recomputation, this method is mandatory."""
-
+    def GetAttachment(self, fp):
+        """Return the base object and its sub shape the fastener is attached to"""
         try:
             baseobj = fp.BaseObject[0]
             shape = baseobj.getSubObject(fp.BaseObject[1][0])
         except:
             baseobj = None
             shape = None
+        return baseobj, shape
+
+    def ApplyShape(self, fp, s, shape):
+        """Set the generated fastener shape s and attach it to shape"""
+        fp.Shape = s
+
+        if shape is not None:
+            # feature = FreeCAD.ActiveDocument.getObject(self.Proxy)
+            # fp.Placement = FreeCAD.Placement() # reset placement
+            FastenerBase.FSMoveToObject(fp, shape, fp.Invert, fp.Offset.Value, fp.OffsetAngle.Value)
+
+    def execute(self, fp):
+        """Print a short message when doing a recomputation, this method is mandatory."""
+
+        baseobj, shape = self.GetAttachment(fp)
 
         # for backward compatibility: add missing attribute if needed
         # self.VerifyMissingAttrs(fp, fp.Diameter)
@@ -706,6 +831,14 @@ class FSScrewObject(FSBaseObject):
                     fp.Length = 'Custom'
                 origLen = self.ActiveLength(fp)
                 origIsCustom = fp.Length == 'Custom'
+                requested = getattr(self, 'requestedLength', None)
+                if requested is not None:
+                    del self.requestedLength
+                    if requested == 'Custom':
+                        origIsCustom = True
+                    else:
+                        origLen = requested
+                        origIsCustom = False
                 self.calc_diam, l, auto_width = screwMaker.FindClosest(
                     fp.Type, self.calc_diam, origLen, width)
                 if self.calc_diam != fp.Diameter:
@@ -720,7 +853,7 @@ class FSScrewObject(FSBaseObject):
                 if origIsCustom:
                     l = origLen
 
-                if l != origLen or diameterchange or typechange or widthchange:
+                if l != origLen or diameterchange or typechange or widthchange or requested is not None:
                     if diameterchange or typechange or widthchange:
                         fp.Length = screwMaker.GetAllLengths(
                             fp.Type, fp.Diameter, hasattr(fp, 'LengthCustom'), width)
@@ -767,8 +900,6 @@ class FSScrewObject(FSBaseObject):
         else:
             self.calc_pitch = None
 
-        screwMaker.updateFastenerParameters()
-
         self.BackupObject(fp)
         self.baseType = FSGetTypeAlias(self.Type)
 
@@ -776,11 +907,17 @@ class FSScrewObject(FSBaseObject):
         # FastenerBase.FSCacheRemoveThreaded. This way it will allow to correctly recompute
         # the threaded screws and nuts in case of changing the 3D Printing settings in Fasteners Workbench.
         (key, s) = FastenerBase.FSGetKey(self.GetKey())
+        FSThreadJobs.Manager.Release(fp, key)
+        pending = False
         if s is None:
-            s = screwMaker.createFastener(self)
-            FastenerBase.FSCache[key] = s
+            if self.Thread and FSThreadJobs.Manager.CanSubmit(key):
+                s = self.GenerateDeferred(fp, key)
+                pending = True
+            else:
+                s = self.GenerateShape(key)
         else:
             FreeCAD.Console.PrintLog("Using cached object\n")
+        self.SetShapeKey(fp, "" if pending else self.GetShapeKey(key))
 
         # Formation of fastener name: DxLxH(LH)-Type
         dispDiam = self.CleanDecimals(self.calc_diam)
@@ -802,12 +939,51 @@ class FSScrewObject(FSBaseObject):
         fp.Label = label
 
         # self.familyType = s[1]
-        fp.Shape = s
-
-        if shape is not None:
-            # feature = FreeCAD.ActiveDocument.getObject(self.Proxy)
-            # fp.Placement = FreeCAD.Placement() # reset placement
-            FastenerBase.FSMoveToObject(fp, shape, fp.Invert, fp.Offset.Value, fp.OffsetAngle.Value)
+        self.ApplyShape(fp, s, shape)
+
+
+class FSFastenerPatternObject(FSScrewObject):
+    """One fastener spec attached to many holes. The fastener shape is generated
+    once and shared by all holes, so a recompute only updates the placements."""
+
+    def __init__(self, obj, type, holes):
+        obj.addProperty("App::PropertyXLinkSubList", "Holes", "Parameters", translate(
+            "FastenerCmd", "Holes the fasteners are attached to")).Holes = holes
+        super().__init__(obj, type, None)
+
+    def GetHoleShapes(self, fp):
+        shapes = []
+        for baseobj, subs in fp.Holes:
+            for sub in subs:
+                shapes.append(baseobj.getSubObject(sub))
+        return shapes
+
+    def GetAttachment(self, fp):
+        # the first hole is used to match the diameter
+        for baseobj, subs in fp.Holes:
+            for sub in subs:
+                return baseobj, baseobj.getSubObject(sub)
+        return None, None
+
+    def ApplyShape(self, fp, s, shape):
+        frames = [FastenerBase.FSGetAttachmentFrame(h) for h in self.GetHoleShapes(fp) if h is not None]
+        frames = [f for f in frames if f[1] is not None]
+        n = len(frames)
+        placements = FastenerBase.FSComputePlacements(
+            [f[0] for f in frames], [f[1] for f in frames],
+            [fp.Invert] * n, [fp.Offset.Value] * n, [fp.OffsetAngle.Value] * n)
+        fp.Shape = Part.makeCompound([FastenerBase.FSLocatedShape(s, pl) for pl in placements])
+        # holes without an axis get no fastener, the BOM uses this count
+        if not hasattr(fp, "FastenerCount"):
+            fp.addProperty("App::PropertyInteger", "FastenerCount", "Parameters", translate(
+                "FastenerCmd", "Number of placed fasteners"))
+            fp.setEditorMode("FastenerCount", 1)
+        if fp.FastenerCount != len(placements):
+            fp.FastenerCount = len(placements)
+
+    def CacheStoredShape(self, obj):
+        # the stored shape is the whole pattern, not a single fastener
+        return
 
 
 class FSViewProviderTree:
@@ -878,10 +1054,20 @@ class FSScrewCommand:
                 'ToolTip': self.Help}
 
     def Activated(self):
-        for selObj in FastenerBase.FSGetAttachableSelections():
+        selObjs = FastenerBase.FSGetAttachableSelections()
+        if len(selObjs) > 1 and FSParam.GetBool("CreateFastenerPatterns", False):
+            # one pattern object for all the selected holes
+            holes = {}
+            for obj, subs in selObjs:
+                holes.setdefault((obj.Document.Name, obj.Name), (obj, []))[1].extend(subs)
+            selObjs = [list(holes.values())]
+            FastenerClass = FSFastenerPatternObject
+        else:
+            FastenerClass = FSScrewObject
+        for selObj in selObjs:
             a = FreeCAD.ActiveDocument.addObject("Part::FeaturePython",
                                                  self.TypeName)
-            FSScrewObject(a, self.Type, selObj)
+            FastenerClass(a, self.Type, selObj)
             a.Label = a.Proxy.familyType
             if FSParam.GetBool("DefaultFastenerColorActive", False):
                 a.ViewObject.DiffuseColor = FSParam.GetUnsigned("DefaultFastenerColor", 0xccccccff)
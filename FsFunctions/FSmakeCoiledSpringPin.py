@@ -24,15 +24,32 @@
 *                                                                         *
 ***************************************************************************
 """
+import numpy as np
 from screw_maker import *
 
 
-def makeCoiledSpringPin(self, fa):
-    if fa.Type in ["ISO8748", "ISO8750", "ISO8751"]:
-        d_1, d_2, a, s = fa.dimTable
-    else:
-        raise NotImplementedError(f"Unknown fastener type: {fa.Type}")
-    length = fa.calc_len
+def makeSpiral(d_2, s, turns, tolerance):
+    """Return a B-spline approximating the spiral the pin profile is swept along"""
+    # NOTE: counter-intuitively, during testing, adding MORE reference points to the
+    # spline increased the performance of the swept solid, while also eliminating
+    # degenerate results for some sizes. Don't reduce the samples and expect a simple
+    # perf boost! The spiral is sampled densely and OCC reduces the poles within tolerance.
+    t = np.linspace(0.0, turns, int(100 * turns) + 1)
+    # using d_2 for the reference radius is important here. The sweep path should
+    # intersect with some point of the initial profile, otherwise the profile may be
+    # transformed in unexpected ways during the sweep process
+    # multiply by 1.01 to avoid self-intersecting faces in the spiral
+    radius = d_2 / 2 - 1.01 * s * t
+    angle = -2 * math.pi * t
+    xs = (radius * np.cos(angle)).tolist()
+    ys = (radius * np.sin(angle)).tolist()
+    points = [Base.Vector(x, y, 0.0) for x, y in zip(xs, ys)]
+    spiral = Part.BSplineCurve()
+    spiral.approximate(Points=points, DegMin=3, DegMax=3, Tolerance=tolerance)
+    return spiral
+
+
+def makePin(self, d_1, d_2, a, s, length):
     fm = FSFaceMaker()
     fm.AddPoint(d_1 / 2-s, -a)
     fm.AddPoint(d_2 / 2 - s, 0.0)
@@ -43,43 +60,20 @@ def makeCoiledSpringPin(self, fa):
     fm.AddPoint(d_2 / 2 - s, -length)
     fm.AddPoint(d_1 / 2 - s, a-length)
     # create a swept spiral profile
-    # NOTE: counter-intuitively, during testing, adding MORE reference points to the
-    # spline increased the performance of the swept solid, while also eliminating
-    # degenerate results for some sizes. Don't reduce r and expect a simple perf boost!
-    r = 100
-    turns = 2.25
-    points = []
-    for i in range(int(r * turns) + 1):
-        # using d_2 for the reference radius is important here. The sweep path should
-        # intersect with some point of the initial profile, otherwise the profile may be
-        # transformed in unexpected ways during the sweep process
-        points.append(
-            Base.Vector(
-                # multiply by 1.01 to avoid self-intersecting faces in the spiral
-                #            |
-                #            v
-                (d_2 / 2 - 1.01 * s * i / r) * math.cos(-i / r * 2 * math.pi),
-                (d_2 / 2 - 1.01 * s * i / r) * math.sin(-i / r * 2 * math.pi),
-                0.0,
-            )
-        )
-    # ref: https://forum.freecad.org/viewtopic.php?t=47282
-    # Part.BSplineCurve([poles],              #[vector]
-    #                 [multiplicities],     #[int]
-    #                 [knots],              #[float]
-    #                 periodic,             #bool
-    #                 degree,               #int
-    #                 [weights],            #[float]
-    #                 checkRational)        #bool
-    spiral = Part.BSplineCurve(points, None, None, False, 3, None, False)
-    sweep = Part.BRepOffsetAPI.MakePipeShell(Part.Wire([spiral.toShape()]))
-    sweep.setFrenetMode(True)
-    sweep.add(fm.GetClosedWire())
-    if sweep.isReady():
-        sweep.build()
+    # the coils are only 0.01 * s apart, so the pin does not follow the thread
+    # quality setting: coarser tolerances would let them touch
+    spiral = makeSpiral(d_2, s, 2.25, s * 1e-3)
+    # normal quality uses the OCC default sweep settings
+    return self.MakePipeShell(
+        Part.Wire([spiral.toShape()]), [fm.GetClosedWire()], None, "Failed to create sweep!", quality=1)
+
+
+def makeCoiledSpringPin(self, fa):
+    if fa.Type in ["ISO8748", "ISO8750", "ISO8751"]:
+        d_1, d_2, a, s = fa.dimTable
     else:
-        # geometry couldn't be generated in a usable form
-        raise RuntimeError("Failed to create sweep!")
-    sweep.makeSolid()
-    shape = sweep.shape()
-    return shape
+        raise NotImplementedError(f"Unknown fastener type: {fa.Type}")
+    length = fa.calc_len
+    return self.GetCachedPart(
+        ("CoiledSpringPin", d_1, d_2, a, s, length),
+        makePin, self, d_1, d_2, a, s, length)
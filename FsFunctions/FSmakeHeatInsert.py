@@ -81,8 +81,8 @@ def makeHeatInsert(self, fa):
             Base.Vector(0.0, 0.0, 0.0), Base.Vector(1.0, 0.0, 0.0), 180
         )
         fSolid = fSolid.cut(thread_cutter)
-        knurlCut = self.CreateKnurlCutter(extDiam, c * 2, k1 - 0.01, -k1 + 0.02, False)
-        fSolid = fSolid.cut(knurlCut)
-        knurlCut = self.CreateKnurlCutter(extDiam, c * 2, k4 - 0.01, -k1 + 0.02, True)
-        fSolid = fSolid.cut(knurlCut)
+        if self.KnurlEnabled():
+            knurlCut1 = self.CreateKnurlCutter(extDiam, c * 2, k1 - 0.01, -k1 + 0.02, False)
+            knurlCut2 = self.CreateKnurlCutter(extDiam, c * 2, k4 - 0.01, -k1 + 0.02, True)
+            fSolid = fSolid.cut([knurlCut1, knurlCut2])
     return fSolid
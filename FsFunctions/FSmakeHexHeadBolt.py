@@ -83,12 +83,9 @@ def makeHexHeadBolt(self, fa):
 
     # needed for chamfer at head top
     cham = (e - s) * math.sin(math.radians(15))
-    # lay out head profile
+    # lay out washer face and shank profile
     fm = FSFaceMaker()
-    fm.AddPoint(0.0, k)
-    fm.AddPoint(s / 2.0, k)
-    fm.AddPoint(s / sqrt3, k - cham)
-    fm.AddPoint(s / sqrt3, c)
+    fm.AddPoint(0.0, c)
     fm.AddPoint(dw / 2.0, c)
     fm.AddPoint(dw / 2.0, 0.0)
     fm.AddPoint(dia / 2.0 + r, 0.0)
@@ -103,10 +100,10 @@ def makeHexHeadBolt(self, fa):
     fm.AddPoint(dia * 4 / 10, -length)
     fm.AddPoint(0.0, -length)
     shape = self.RevolveZ(fm.GetFace())
-    # create cutting tool for hexagon head
-    extrude = self.makeHexPrism(s, k + length + 2)
-    extrude.translate(Base.Vector(0.0, 0.0, -length - 1))
-    shape = shape.common(extrude)
+    # add the chamfered hexagon head
+    head = self.makeChamferedHexPrism(s, k - c, cham)
+    head.translate(Base.Vector(0.0, 0.0, c))
+    shape = shape.fuse(head)
     if fa.Thread:
         thread_cutter = self.CreateBlindThreadCutter(dia, P, thread_length)
         thread_cutter.translate(Base.Vector(0.0, 0.0, -1 * (length - thread_length)))
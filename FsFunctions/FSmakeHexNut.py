@@ -68,22 +68,19 @@ def makeHexNut(self, fa):
     H = P * cos30
     cham_i_delta = da / 2.0 - (dia / 2.0 - H * 5.0 / 8.0)
     cham_i = cham_i_delta * math.tan(math.radians(15.0))
-    # layout the nut profile, then create a revolved solid
+    nut = self.makeChamferedHexPrism(s, m, cham, cham)
+    # layout the bore profile with the inner chamfers extended beyond the
+    # nut faces, then create a revolved cutting tool
+    ri = dia / 2.0 - H * 5.0 / 8.0
     fm = FastenerBase.FSFaceMaker()
-    fm.AddPoint(dia / 2.0 - H * 5.0 / 8.0, m - cham_i)
-    fm.AddPoint(da / 2.0, m)
-    fm.AddPoint(s / 2.0, m)
-    fm.AddPoint(s / sqrt3, m - cham)
-    fm.AddPoint(s / sqrt3, cham)
-    fm.AddPoint(s / 2.0, 0.0)
-    fm.AddPoint(da / 2.0, 0.0)
-    fm.AddPoint(dia / 2.0 - H * 5.0 / 8.0, 0.0 + cham_i)
-    head = self.RevolveZ(fm.GetFace())
-    # create cutting tool for hexagon head
-    extrude = self.makeHexPrism(s, m)
-    nut = head.common(extrude)
+    fm.AddPoint(0.0, m + cham_i / 2.0)
+    fm.AddPoint(da / 2.0 + cham_i_delta / 2.0, m + cham_i / 2.0)
+    fm.AddPoint(ri, m - cham_i)
+    fm.AddPoint(ri, cham_i)
+    fm.AddPoint(da / 2.0 + cham_i_delta / 2.0, -cham_i / 2.0)
+    fm.AddPoint(0.0, -cham_i / 2.0)
+    cutters = [self.RevolveZ(fm.GetFace())]
     # add modeled threads if necessary
     if fa.Thread:
-        thread_cutter = self.CreateInnerThreadCutter(dia, P, m + P)
-        nut = nut.cut(thread_cutter)
-    return nut
+        cutters.append(self.CreateInnerThreadCutter(dia, P, m + P))
+    return nut.cut(cutters)
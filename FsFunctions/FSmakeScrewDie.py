@@ -39,24 +39,27 @@ def makeScrewDie(self, fa):
             P = fa.dimTable[0]
     else:  # custom pitch and diameter
         P = fa.calc_pitch
-        if self.sm3DPrintMode:
-            dia = self.smScrewThrScaleA * float(fa.calc_diam) + self.smScrewThrScaleB
-        else:
-            dia = float(fa.calc_diam)
+        dia = self.getDia(float(fa.calc_diam), False)
     length = fa.calc_len
     refpoint = Base.Vector(0, 0, -1 * length)
-    screwDie = Part.makeCylinder(dia * 1.2 / 2, length, refpoint)
+    # die without the thread
+    fm = FSFaceMaker()
+    fm.AddPoint(dia / 2, 0.0)
+    fm.AddPoint(dia * 1.2 / 2, 0.0)
+    fm.AddPoint(dia * 1.2 / 2, -length)
+    fm.AddPoint(dia / 2, -length)
+    ring = self.RevolveZ(fm.GetFace())
     if fa.Thread:
-        thread_cylinder = Part.makeCylinder(dia / 2, length, refpoint)
+        screwDie = Part.makeCylinder(dia * 1.2 / 2, length, refpoint)
         thread_cutter = self.CreateThreadCutter(dia, P, length)
-        thread_cutter = thread_cylinder.cut(thread_cutter)
         #thread_cutter = self.CreateInnerThreadCutter(dia, P, length + 2 * P)
         #thread_cutter.rotate(
         #    Base.Vector(0.0, 0.0, 0.0),
         #    Base.Vector(1.0, 0.0, 0.0),
         #    180
         #)
-        screwDie = screwDie.cut(thread_cutter)
+        # screwDie AND (ring OR thread_cutter) in a single boolean
+        screwDie = screwDie.common([ring, thread_cutter])
     else:
-        screwDie = screwDie.cut(Part.makeCylinder(dia / 2, length, refpoint))
+        screwDie = ring
     return screwDie
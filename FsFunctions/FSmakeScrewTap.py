@@ -39,24 +39,27 @@ def makeScrewTap(self, fa):
             P = fa.dimTable[0]
     else:  # custom pitch and diameter
         P = fa.calc_pitch
-        if self.sm3DPrintMode:
-            dia = self.smNutThrScaleA * \
-                float(fa.calc_diam) + self.smNutThrScaleB
-        else:
-            dia = float(fa.calc_diam)
+        dia = self.getDia(float(fa.calc_diam), True)
+    if not fa.Thread:
+        return Part.makeCylinder(
+            dia / 2 - 0.625 * sqrt3 / 2 * P,
+            fa.calc_len,
+            Base.Vector(0.0, 0.0, 0.0),
+            Base.Vector(0.0, 0.0, -1.0),
+            360
+        )
     tap = Part.makeCylinder(
         dia / 2 - 0.625 * sqrt3 / 2 * P,
         fa.calc_len + 2
     )
     tap.translate(Base.Vector(0.0, 0.0, -1.0))
-    if fa.Thread:
-        threads = self.CreateInnerThreadCutter(dia, P, fa.calc_len + P)
-        tap = tap.fuse(threads)
-    tap.rotate(
-        Base.Vector(0.0, 0.0, 0.0),
-        Base.Vector(1.0, 0.0, 0.0),
-        180
-    )
+    threads = self.CreateInnerThreadCutter(dia, P, fa.calc_len + P)
+    for shape in (tap, threads):
+        shape.rotate(
+            Base.Vector(0.0, 0.0, 0.0),
+            Base.Vector(1.0, 0.0, 0.0),
+            180
+        )
     cyl = Part.makeCylinder(
         dia,
         fa.calc_len,
@@ -64,5 +67,6 @@ def makeScrewTap(self, fa):
         Base.Vector(0.0, 0.0, -1.0),
         360
     )
-    solid = Part.Solid(cyl.common(tap))
+    # cyl AND (tap OR threads) in a single boolean
+    solid = Part.Solid(cyl.common([tap, threads]))
     return solid
@@ -83,6 +83,46 @@ def cutCorners(fastener, radio, depth):
 
     return fastener
 
+def makeSerratedBody(self, a, e1, e2, f, h, k, serrated):
+    """ GN 505 nut and bolt body, with strips on top if serrated """
+    fastener = makeBaseBody(a, e1, e2, f, h, k)
+    # Cut corners in the upper face to enable rotation on slot
+    # a = e1
+    fastener = cutCorners(fastener, a/2, h-k)
+    # Cut corners from the middle face
+    fastener = cutCorners(fastener, e2 / 2, h)
+
+    if serrated:
+        # Add strips
+        p0 = Base.Vector(-e2 / 2, e1 / 2, -h + k)
+        p1 = Base.Vector(-e2 / 2, (e1 / 2) - 0.1 * e1, -h + k)
+        p2 = Base.Vector(-e2 / 2, (e1 / 2) - 0.05 * e1, -h + k + 0.05 * e1)
+
+        edge0 = Part.makeLine(p0, p1)
+        edge1 = Part.makeLine(p1, p2)
+        edge2 = Part.makeLine(p2, p0)
+
+        aWire = Part.Wire([edge0, edge1, edge2])
+        aFace = Part.Face(aWire)
+        strip = aFace.extrude(Base.Vector(e2, 0.0, 0.0))
+        strips = [strip.translated(Base.Vector(0, -0.1 * e1 * i, 0)) for i in range(10)]
+        fastener = fastener.fuse(strips).removeSplitter()
+
+    # Draw a triangle on x = e2 / 2
+    # to cut opposite corners on the bottom
+    fm = FastenerBase.FSFaceMaker()
+    fm.AddPoint((e2 / 2) - f, -h)
+    fm.AddPoint(e2 / 2, -h)
+    fm.AddPoint(e2 / 2, -h + f )
+    qring = self.RevolveZ(fm.GetFace(), angle=-90)
+    fastener = fastener.cut(qring) # first corner
+
+    myMat = Base.Matrix()
+    myMat.rotateZ(math.pi)
+    qring.transformShape(myMat)
+    fastener = fastener.cut(qring) # second corner
+    return fastener
+
 def makeHole(self, fastener, fa, dia, h, P):
     """ Hole with chamfer """
     da = 1.05 * dia
@@ -155,45 +195,10 @@ def makeTSlot(self, fa):  # dynamically loaded method of class Screw
         if fa.Thread:
             k = k - 0.05 * e1 # Take into account strips height
 
-        fastener = makeBaseBody(a, e1, e2, f, h, k)
-        # Cut corners in the upper face to enable rotation on slot
-        # a = e1
-        fastener = cutCorners(fastener, a/2, h-k)
-        # Cut corners from the middle face
-        fastener = cutCorners(fastener, e2 / 2, h)
-
-        if fa.Thread:
-            # Add strips
-            p0 = Base.Vector(-e2 / 2, e1 / 2, -h + k)
-            p1 = Base.Vector(-e2 / 2, (e1 / 2) - 0.1 * e1, -h + k)
-            p2 = Base.Vector(-e2 / 2, (e1 / 2) - 0.05 * e1, -h + k + 0.05 * e1)
-
-            edge0 = Part.makeLine(p0, p1)
-            edge1 = Part.makeLine(p1, p2)
-            edge2 = Part.makeLine(p2, p0)
-
-            aWire = Part.Wire([edge0, edge1, edge2])
-            aFace = Part.Face(aWire)
-            strip = aFace.extrude(Base.Vector(e2, 0.0, 0.0))
-            fastener = fastener.fuse(strip).removeSplitter()
-            for _ in range(9):
-                myMat = Base.Matrix()
-                strip.translate(Base.Vector(0, -0.1 * e1, 0))
-                fastener = fastener.fuse(strip).removeSplitter()
-
-        # Draw a triangle on x = e2 / 2
-        # to cut opposite corners on the bottom
-        fm = FastenerBase.FSFaceMaker()
-        fm.AddPoint((e2 / 2) - f, -h)
-        fm.AddPoint(e2 / 2, -h)
-        fm.AddPoint(e2 / 2, -h + f )
-        qring = self.RevolveZ(fm.GetFace(), angle=-90)
-        fastener = fastener.cut(qring) # first corner
-
-        myMat = Base.Matrix()
-        myMat.rotateZ(math.pi)
-        qring.transformShape(myMat)
-        fastener = fastener.cut(qring) # second corner
+        # the body only depends on the slot width and diameter
+        fastener = self.GetCachedPart(
+            (fa.baseType, d, sWidth, fa.Thread), makeSerratedBody,
+            self, a, e1, e2, f, h, k, fa.Thread)
 
         if fa.baseType == "GN505":
             fastener = makeHole(self, fastener, fa, dia, h, P)
@@ -39,10 +39,7 @@ def makeThreadedRod(self, fa):
             P = fa.dimTable[0]
     else:  # custom pitch and diameter
         P = fa.calc_pitch
-        if self.sm3DPrintMode:
-            dia = self.smScrewThrScaleA * float(fa.calc_diam) + self.smScrewThrScaleB
-        else:
-            dia = float(fa.calc_diam)
+        dia = self.getDia(float(fa.calc_diam), False)
     #dia = dia * 1.01
     cham = P
     length = fa.calc_len
@@ -139,8 +139,12 @@ def makeThumbScrew(self, fa):
 
     # produce a modelled knurling & thread if necessary
     if fa.Thread:
-        knurling_cutter = straightCutter(dk, 0.975 * dk, kn0, kn)
-        screw = screw.cut(knurling_cutter)
+        if self.KnurlEnabled():
+            knurling_cutter = self.GetCachedPart(
+                ("StraightKnurl", dk, 0.975 * dk, kn), straightCutter,
+                dk, 0.975 * dk, kn)
+            knurling_cutter.translate(Base.Vector(0.0, 0.0, kn0))
+            screw = screw.cut(knurling_cutter)
         thread_cutter = self.CreateThreadCutter(dia, P, thread_l)
         thread_cutter.translate(Base.Vector(0.0, 0.0, thread_dz))
         screw = screw.cut(thread_cutter)
@@ -148,7 +152,7 @@ def makeThumbScrew(self, fa):
     return screw
 
 
-def straightCutter(outDia: float, inDia: float, zbase: float, height: float):
+def straightCutter(outDia: float, inDia: float, height: float):
     """Cut a circular array of triangular prisms to obtain a straight knurling."""
     # TODO: Make Screw.CreateKnurlCutter() accepts straight knurling
     # Knurling should be DIN 82 RAA
@@ -165,19 +169,17 @@ def straightCutter(outDia: float, inDia: float, zbase: float, height: float):
     w = Part.Wire([l1, l2, l3])
     face = Part.Face(w)
     cutElement = face.extrude(Base.Vector(0.0, 0.0, height))
-    cutElement.translate(Base.Vector(0.0, 0, zbase))
 
     # FIXME: Ideally the number of elements should be greater
     # to avoid having "gaps" between cuts. Good enough for now.
-    cutElements = [cutElement]
     ang = math.atan(y2 / d2) * 114.6  # 2 * 180 / pi
     numCuts = int(360.0 / ang)
     elementAng = 360 / numCuts
 
-    for i in range(1, numCuts):
-        nextElement = cutElement.copy().rotate(
-            Base.Vector(0, 0, 0), Base.Vector(0, 0, 1), i * elementAng
-        )
-        cutElements.append(nextElement)
+    # rotated instances share the geometry of the first element
+    cutElements = [cutElement] + [
+        cutElement.rotated(Base.Vector(0, 0, 0), Base.Vector(0, 0, 1), i * elementAng)
+        for i in range(1, numCuts)
+    ]
     cutTool = Part.Compound(cutElements)
     return cutTool
@@ -363,9 +363,18 @@ FSAppendAliasesToTable(screwTables)
 class FSScrewMaker(Screw):
     def __init__(self):
         super().__init__()
+        self.closestCache = {}
+        self.updateFastenerParameters()
 
     def FindClosest(self, type, diam, len, width=None):
         """Find closest standard screw to given parameters"""
+        # the tables are fixed, so results can be reused
+        key = (type, diam, len, width)
+        if key not in self.closestCache:
+            self.closestCache[key] = self.FindClosestInTable(type, diam, len, width)
+        return self.closestCache[key]
+
+    def FindClosestInTable(self, type, diam, len, width=None):
         if type not in screwTables:
             return diam, len, width
 
@@ -609,32 +618,45 @@ class FSScrewMaker(Screw):
         return res
 
     def updateFastenerParameters(self):
-        oldState = (
-            str(self.sm3DPrintMode) +
-            str(self.smNutThrScaleA) +
-            str(self.smNutThrScaleB) +
-            str(self.smScrewThrScaleA) +
-            str(self.smScrewThrScaleB)
-        )
-        self.sm3DPrintMode = False
+        """Read the thread generation settings and remove the cached shapes
+        that depend on changed ones. Called when the preferences change"""
         # threading modes: 0 = standard, 1 = 3dprint
-        threadMode = FSParam.GetInt("ScrewToolbarThreadGeneration", 0)
-        if threadMode == 1:
-            self.sm3DPrintMode = True
-        self.smNutThrScaleA = FSParam.GetFloat("NutThrScaleA", 1.03)
-        self.smNutThrScaleB = FSParam.GetFloat("NutThrScaleB", 0.1)
-        self.smScrewThrScaleA = FSParam.GetFloat("ScrewThrScaleA", 0.99)
-        self.smScrewThrScaleB = FSParam.GetFloat("ScrewThrScaleB", -0.05)
-        newState = (
-            str(self.sm3DPrintMode) +
-            str(self.smNutThrScaleA) +
-            str(self.smNutThrScaleB) +
-            str(self.smScrewThrScaleA) +
-            str(self.smScrewThrScaleB)
-        )
-        if oldState != newState:
-            # thread parameters have changed, remove cached ones
+        printMode = FSParam.GetInt("ScrewToolbarThreadGeneration", 0) == 1
+        nutScale = (FSParam.GetFloat("NutThrScaleA", 1.03), FSParam.GetFloat("NutThrScaleB", 0.1))
+        screwScale = (FSParam.GetFloat("ScrewThrScaleA", 0.99), FSParam.GetFloat("ScrewThrScaleB", -0.05))
+        cosmeticKnurl = FSParam.GetBool("CosmeticKnurl", False)
+        threadQuality = min(max(FSParam.GetInt("ThreadQuality", 1), 0), 2)
+        # thread representations: 0 = helical, 1 = stacked rings
+        ringThreads = FSParam.GetInt("ThreadRepresentation", 0) == 1
+        if (printMode, nutScale, screwScale, cosmeticKnurl, threadQuality, ringThreads) != (
+                self.sm3DPrintMode, (self.smNutThrScaleA, self.smNutThrScaleB),
+                (self.smScrewThrScaleA, self.smScrewThrScaleB), self.smCosmeticKnurl,
+                self.smThreadQuality, self.smRingThreads):
+            # thread tools and other shared parts of the old settings are no
+            # longer used
+            self.partCache.clear()
+        if printMode != self.sm3DPrintMode:
+            # thread mode has changed, remove cached ones
             FastenerBase.FSCacheRemoveThreaded()
+            FastenerBase.FSCacheRemoveTagged("NutScale")
+            FastenerBase.FSCacheRemoveTagged("ScrewScale")
+        elif printMode:
+            if nutScale != (self.smNutThrScaleA, self.smNutThrScaleB):
+                FastenerBase.FSCacheRemoveTagged("NutScale")
+            if screwScale != (self.smScrewThrScaleA, self.smScrewThrScaleB):
+                FastenerBase.FSCacheRemoveTagged("ScrewScale")
+        if cosmeticKnurl != self.smCosmeticKnurl:
+            FastenerBase.FSCacheRemoveTagged("Knurl")
+        if threadQuality != self.smThreadQuality:
+            FastenerBase.FSCacheRemoveTagged("ThreadQuality")
+        if ringThreads != self.smRingThreads:
+            FastenerBase.FSCacheRemoveTagged("ThreadRepresentation")
+        self.sm3DPrintMode = printMode
+        self.smCosmeticKnurl = cosmeticKnurl
+        self.smThreadQuality = threadQuality
+        self.smRingThreads = ringThreads
+        self.smNutThrScaleA, self.smNutThrScaleB = nutScale
+        self.smScrewThrScaleA, self.smScrewThrScaleB = screwScale
 
     def createFastener(self, fastenerAttribs):
         func = screwTables[fastenerAttribs.baseType][FUNCTION_POS]
@@ -642,3 +664,20 @@ class FSScrewMaker(Screw):
 
 
 Instance = FSScrewMaker()
+
+
+# preferences that change the generated threads
+FSThreadParameters = ("ScrewToolbarThreadGeneration", "NutThrScaleA", "NutThrScaleB", "ScrewThrScaleA", "ScrewThrScaleB",
+                      "CosmeticKnurl", "ThreadQuality", "ThreadRepresentation")
+
+
+class FSParamObserver:
+    """Push changed thread generation settings to the screw maker"""
+
+    def onChange(self, grp, param):
+        if param in FSThreadParameters:
+            Instance.updateFastenerParameters()
+
+
+ParamObserver = FSParamObserver()
+FSParam.Attach(ParamObserver)
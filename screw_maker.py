@@ -102,8 +102,23 @@ sqrt3 = math.sqrt(3.0)
 cos30 = sqrt3 / 2.0           # math identity: math.cos(math.radians(30.0))
 tan15 = 2.0 - sqrt3           # math identity: math.tan(math.radians(15))
 
+# sweep settings of the thread qualities draft, normal and exact:
+# (tolerance, angular tolerance, max. surface degree, max. segments)
+# normal uses the OCC defaults
+ThreadQualities = (
+    (1e-2, 1e-1, 6, 15),
+    (1e-4, 1e-2, 11, 30),
+    (1e-6, 1e-3, 14, 60),
+)
+
 
 class Screw:
+    # parts shared between fasteners, like recesses and thread tools.
+    # keyed by the part name and the dimensions it depends on. The least
+    # recently used parts are dropped when partCacheSize is exceeded
+    partCache = {}
+    partCacheSize = 200
+
     def __init__(self):
         self.objAvailable = True
         self.Tuner = 510
@@ -115,6 +130,16 @@ class Screw:
         self.smNutThrScaleB = 0.0
         self.smScrewThrScaleA = 1.0
         self.smScrewThrScaleB = 0.0
+        # knurls are left out of the shape if set
+        self.smCosmeticKnurl = False
+        # index into ThreadQualities: 0 = draft, 1 = normal, 2 = exact
+        self.smThreadQuality = 1
+        # threads are approximated by stacked rings instead of helices if set
+        self.smRingThreads = False
+        # scalings ("NutScale", "ScrewScale") and settings ("Knurl",
+        # "ThreadQuality", "ThreadRepresentation") used by the last created
+        # fastener
+        self.scaledThreads = set()
 
     def createScrew(self, function, fastenerAttribs):
         # self.simpThread = self.SimpleScrew.isChecked()
@@ -122,6 +147,7 @@ class Screw:
         # FreeCAD.Console.PrintMessage(NL_text + "\n")
         if not self.objAvailable:
             return None
+        self.scaledThreads = set()
         try:
             if fastenerAttribs.calc_len is not None:
                 fastenerAttribs.calc_len = self.getLength(
@@ -173,6 +199,40 @@ class Screw:
         - ri: inner radius
         - p:  thread pitch
         """
+        tipH = ze - zt
+        length = zs - ze
+        if self.RingThreadsEnabled():
+            # rings along the body only, the tip is left unthreaded
+            epsilon = 0.03
+            tphb = (ro - ri) / math.tan(math.radians(60))  # thread profile half base
+            thread_solid = self.GetCachedPart(
+                ("RingDin7998", ri, ro, p, round(length, 6)), self.makeRingThread,
+                ri - 2 * epsilon, ro, ri - epsilon, p - 2 * tphb, p, 0.0, -length)
+            thread_solid.translate(FreeCAD.Vector(0.0, 0.0, zs))
+            return thread_solid
+        # tip and body are shared by screws of different lengths
+        quality = self.GetThreadQuality()
+        body_solid = self.GetCachedPart(
+            ("Din7998Body", ri, ro, p, round(length, 6), self.LeftHanded, quality),
+            self.makeDin7998Body, ri, ro, p, length, self.LeftHanded)
+        body_solid.translate(FreeCAD.Vector(0.0, 0.0, tipH))
+        # Only make the tip thread when the point is not flat
+        if isFlat:
+            thread_solid = body_solid
+        else:
+            tip_solid = self.GetCachedPart(
+                ("Din7998Tip", ri, ro, p, round(tipH, 6), self.LeftHanded, quality),
+                self.makeDin7998Tip, ri, ro, p, tipH, self.LeftHanded)
+            thread_solid = body_solid.fuse(tip_solid)
+        thread_solid.translate(FreeCAD.Vector(0.0, 0.0, zt))
+        # rotate the thread solid to prevent OCC errors due to cylinder seams aligning
+        thread_solid.rotate(Base.Vector(0, 0, 0), Base.Vector(0, 0, 1), 180)
+        #Part.show(thread_solid, "thread_solid")
+        return thread_solid
+
+    @staticmethod
+    def makeDin7998Profiles(ri: float, ro: float, tipH: float):
+        """Return the tip start and the full thread profiles of a DIN 7998 thread"""
         # epsilon needed since OCCT struggle to handle overlaps
         epsilon = 0.03
         tph = ro - ri                           # thread profile height
@@ -181,7 +241,6 @@ class Screw:
         tpratio = 0.5
         tph2 = tph * tpratio
         tphb2 = tphb * tpratio
-        tipH = ze - zt
 
         # tip thread profile
         fm = FastenerBase.FSFaceMaker()
@@ -194,53 +253,101 @@ class Screw:
         fm.AddPoints((0.0, -tphb), (0.0, tphb), (tph, 0.0))
         bWire = fm.GetClosedWire()
         bWire.translate(FreeCAD.Vector(ri - epsilon, 0.0, tphb + tipH))
-
-        # Only make the tip helix when the point is not flat
-        if not isFlat:
-            # create helix for tip thread part
-            numTurns = math.floor(tipH / p) or 1
-            FreeCAD.Console.PrintMessage(str(numTurns))
-            # Part.show(hlx)
-            hlx = Part.makeLongHelix(p, numTurns * p, 5, 0, self.LeftHanded)
-            sweep = Part.BRepOffsetAPI.MakePipeShell(hlx)
-            sweep.setFrenetMode(True)
-            sweep.setTransitionMode(1)  # right corner transition
-            sweep.add(aWire)
-            sweep.add(bWire)
-            if sweep.isReady():
-                sweep.build()
-                sweep.makeSolid()
-                tip_solid = sweep.shape()
-                tip_solid.translate(FreeCAD.Vector(0.0, 0.0, zt))
-                # Part.show(tip_solid)
-            else:
-                raise RuntimeError("Failed to create woodscrew tip thread")
-
-
-        # create helix for body thread part
-        hlx = Part.makeLongHelix(p, zs - ze, 5, 0, self.LeftHanded)
-        hlx.translate(FreeCAD.Vector(0.0, 0.0, tipH))
-        sweep = Part.BRepOffsetAPI.MakePipeShell(hlx)
+        return aWire, bWire
+
+    def makeDin7998Tip(self, ri: float, ro: float, p: float, tipH: float, leftHanded: bool) -> Part.Shape:
+        """create the tip part of a DIN 7998 thread, from z=0 to tipH"""
+        aWire, bWire = self.makeDin7998Profiles(ri, ro, tipH)
+        numTurns = math.floor(tipH / p) or 1
+        hlx = Part.makeLongHelix(p, numTurns * p, 5, 0, leftHanded)
+        # right corner transition
+        return self.MakePipeShell(hlx, [aWire, bWire], 1, "Failed to create woodscrew tip thread")
+
+    def makeDin7998Body(self, ri: float, ro: float, p: float, length: float, leftHanded: bool) -> Part.Shape:
+        """create the body part of a DIN 7998 thread, starting at z=0"""
+        aWire, bWire = self.makeDin7998Profiles(ri, ro, 0.0)
+        hlx = Part.makeLongHelix(p, length, 5, 0, leftHanded)
+        # right corner transition
+        return self.MakePipeShell(hlx, [bWire], 1, "Failed to create woodscrew body thread")
+
+    def RingThreadsEnabled(self) -> bool:
+        """Return whether threads are approximated by stacked rings. The
+        fastener is tagged, so it is regenerated when the setting changes"""
+        self.scaledThreads.add("ThreadRepresentation")
+        return self.smRingThreads
+
+    def makeRingThread(
+        self, rBase: float, rValley: float, rTip: float, tipFlat: float,
+        P: float, zTop: float, zBottom: float
+    ) -> Part.Shape:
+        """create a pseudo thread of stacked rings, by revolving a sawtooth
+        profile. Much faster than a helical sweep, for visualization.
+        Parameters:
+        - rBase: radius of the plain side of the profile
+        - rValley: radius of the sharp valleys, at zTop and each pitch below
+        - rTip: radius of the flat tips, half a pitch between the valleys
+        - tipFlat: axial width of the tips
+        - P: thread pitch
+        - zTop, zBottom: z range, the last ring is cut off at zBottom
+        """
+        tipFlat = max(tipFlat, 0.0)
+        flank = (P - tipFlat) / 2.0
+        turns = max(1, math.ceil((zTop - zBottom) / P - 1e-6))
+        profile = []
+        z = zTop
+        for i in range(turns):
+            profile.append((rValley, z))
+            profile.append((rTip, z - flank))
+            if tipFlat > 0.0:
+                profile.append((rTip, z - flank - tipFlat))
+            z -= P
+        profile.append((rValley, z))
+        fm = FSFaceMaker()
+        fm.AddPoint(rBase, zTop)
+        r0, z0 = profile[0]
+        fm.AddPoint(r0, z0)
+        for r1, z1 in profile[1:]:
+            if z1 < zBottom + 1e-6:
+                # end the profile where this segment crosses zBottom
+                fm.AddPoint(r0 + (r1 - r0) * (z0 - zBottom) / (z0 - z1), zBottom)
+                break
+            fm.AddPoint(r1, z1)
+            r0, z0 = r1, z1
+        fm.AddPoint(rBase, zBottom)
+        return self.RevolveZ(fm.GetFace())
+
+    def GetThreadQuality(self) -> int:
+        """Return the thread quality, to be added to the cache keys of thread
+        tools. The fastener is tagged, so it is regenerated when the setting
+        changes"""
+        self.scaledThreads.add("ThreadQuality")
+        return self.smThreadQuality
+
+    def MakePipeShell(
+        self, path, profiles, transition=None, error="Failed to sweep thread", quality=None
+    ) -> Part.Shape:
+        """Sweep the profiles along path in Frenet mode, with the settings of
+        the thread quality, and return the resulting solid.
+        transition is the corner transition mode, None for the default.
+        quality overrides the thread quality setting, for sweeps that are not threads"""
+        if quality is None:
+            quality = self.smThreadQuality
+        tol, angTol, maxDegree, maxSegments = ThreadQualities[quality]
+        sweep = Part.BRepOffsetAPI.MakePipeShell(path)
         sweep.setFrenetMode(True)
-        sweep.setTransitionMode(1)  # right corner transition
-        sweep.add(bWire)
-        if sweep.isReady():
-            sweep.build()
-            sweep.makeSolid()
-            body_solid = sweep.shape()
-            body_solid.translate(FreeCAD.Vector(0.0, 0.0, zt))
-            # Part.show(body_solid)
-        else:
-            raise RuntimeError("Failed to create woodscrew body thread")
-
-        if isFlat:
-            thread_solid = body_solid
-        else:
-            thread_solid = body_solid.fuse(tip_solid)
-        # rotate the thread solid to prevent OCC errors due to cylinder seams aligning
-        thread_solid.rotate(Base.Vector(0, 0, 0), Base.Vector(0, 0, 1), 180)
-        #Part.show(thread_solid, "thread_solid")
-        return thread_solid
+        if transition is not None:
+            sweep.setTransitionMode(transition)
+        sweep.setTolerance(tol, tol, angTol)
+        sweep.setMaxDegree(maxDegree)
+        sweep.setMaxSegments(maxSegments)
+        for profile in profiles:
+            sweep.add(profile)
+        if not sweep.isReady():
+            # geometry couldn't be generated in a usable form
+            raise RuntimeError(error)
+        sweep.build()
+        sweep.makeSolid()
+        return sweep.shape()
 
     @staticmethod
     def GetInnerThreadMinDiameter(
@@ -262,6 +369,18 @@ class Screw:
 
         The shape is created at the origin, extending in the -Z direction.
         """
+        if self.RingThreadsEnabled():
+            H = sqrt3 / 2 * P
+            dia2 = dia / 2
+            return self.GetCachedPart(
+                ("RingThreadCutter", dia, P, blen), self.makeRingThread,
+                dia2 + H / 4, dia2 + H / 8, dia2 - 5 * H / 8, P / 4, P,
+                P / 2, -(blen // P + 1) * P)
+        return self.GetCachedPart(
+            ("ThreadCutter", dia, P, blen, self.LeftHanded, self.GetThreadQuality()),
+            self.makeThreadCutter, dia, P, blen)
+
+    def makeThreadCutter(self, dia: float, P: float, blen: float) -> Part.Shape:
         # create a sketch profile of the thread
         # ref: https://en.wikipedia.org/wiki/ISO_metric_screw_thread
         H = sqrt3 / 2 * P
@@ -284,22 +403,25 @@ class Screw:
         helix = Part.makeLongHelix(
             P, helix_height, dia / 2, 0, self.LeftHanded)
         helix.rotate(Base.Vector(0, 0, 0), Base.Vector(1, 0, 0), 180)
-        sweep = Part.BRepOffsetAPI.MakePipeShell(helix)
-        sweep.setFrenetMode(True)
-        sweep.setTransitionMode(1)  # right corner transition
-        sweep.add(thread_profile_wire)
-        if sweep.isReady():
-            sweep.build()
-        else:
-            # geometry couldn't be generated in a usable form
-            raise RuntimeError(
-                "Failed to create shell thread: could not sweep thread")
-        sweep.makeSolid()
-        threads = sweep.shape()
+        # right corner transition
+        threads = self.MakePipeShell(
+            helix, [thread_profile_wire], 1,
+            "Failed to create shell thread: could not sweep thread")
         threads.translate(Base.Vector(0.0, 0.0, P / 2))
         return threads
 
     def CreateInnerThreadCutter(self, dia: float, P: float, blen: float) -> Part.Shape:
+        if self.RingThreadsEnabled():
+            H = P * cos30
+            r = dia / 2.0
+            return self.GetCachedPart(
+                ("RingInnerThreadCutter", dia, P, blen), self.makeRingThread,
+                r - H, r - 7 * H / 8, r, P / 8, P, blen, -P / 2)
+        return self.GetCachedPart(
+            ("InnerThreadCutter", dia, P, blen, self.LeftHanded, self.GetThreadQuality()),
+            self.makeInnerThreadCutter, dia, P, blen)
+
+    def makeInnerThreadCutter(self, dia: float, P: float, blen: float) -> Part.Shape:
         H = P * cos30  # Thread depth H
         r = dia / 2.0
 
@@ -323,12 +445,23 @@ class Screw:
         W0 = fm.GetClosedWire()
         W0.translate(Base.Vector(0, 0, -P * 9.0 / 16.0))
 
-        makeSolid = True
-        isFrenet = True
-        cutTool = Part.Wire(helix).makePipeShell([W0], makeSolid, isFrenet)
+        cutTool = self.MakePipeShell(Part.Wire(helix), [W0])
         return cutTool
 
+    def KnurlEnabled(self) -> bool:
+        """Return whether knurls are modelled. The fastener is tagged, so it is
+        regenerated when the cosmetic knurl setting changes"""
+        self.scaledThreads.add("Knurl")
+        return not self.smCosmeticKnurl
+
     def CreateKnurlCutter(self, outDia: float, inDia: float, zbase: float, height: float, leftHanded: bool) -> Part.Shape:
+        cutTool = self.GetCachedPart(
+            ("Knurl", outDia, inDia, height, leftHanded, self.GetThreadQuality()), self.makeKnurlCutter,
+            outDia, inDia, height, leftHanded)
+        cutTool.translate(Base.Vector(0, 0, zbase))
+        return cutTool
+
+    def makeKnurlCutter(self, outDia: float, inDia: float, height: float, leftHanded: bool) -> Part.Shape:
         ro = outDia / 2.0
         ri = inDia / 2.0
         p = outDia * 3.1415
@@ -350,16 +483,16 @@ class Screw:
         l3 = Part.makeLine(p3, p1)
         w = Part.Wire([l1,l2, l3])
 
-        cutElement = Part.Wire(helix).makePipeShell([w], True, True)
-        cutElement.translate(Base.Vector(0, 0, zbase))
-        cutElements = [cutElement]
+        cutElement = self.MakePipeShell(Part.Wire(helix), [w])
         ang = math.atan(y2 / d2) * 114.6 # 2 * 180 / pi
         numCuts = int(360.0 / ang)
         elementAng = 360 / numCuts
 
-        for i in range(1, numCuts):
-            nextElement = cutElement.copy().rotate(Base.Vector(0,0,0), Base.Vector(0,0,1), i * elementAng)
-            cutElements.append(nextElement)
+        # rotated instances share the geometry of the first element
+        cutElements = [cutElement] + [
+            cutElement.rotated(Base.Vector(0,0,0), Base.Vector(0,0,1), i * elementAng)
+            for i in range(1, numCuts)
+        ]
         cutTool = Part.Compound(cutElements)
         return cutTool
 
@@ -378,6 +511,18 @@ class Screw:
         It has a tapered lead out at the top of the shape, to simulate the
         partially threaded section of a cut or rolled screw thread.
         """
+        if self.RingThreadsEnabled():
+            H = sqrt3 / 2 * P
+            dia2 = dia / 2
+            return self.GetCachedPart(
+                ("RingBlindThreadCutter", dia, P, blen), self.makeRingThread,
+                dia2 + H / 4, dia2 + H / 8, dia2 - 5 * H / 8, P / 4, P,
+                -0.1 * P, -(blen // P + 2) * P)
+        return self.GetCachedPart(
+            ("BlindThreadCutter", dia, P, blen, self.LeftHanded, self.GetThreadQuality()),
+            self.makeBlindThreadCutter, dia, P, blen)
+
+    def makeBlindThreadCutter(self, dia: float, P: float, blen: float) -> Part.Shape:
         # create a sketch profile of the thread
         # ref: https://en.wikipedia.org/wiki/ISO_metric_screw_thread
         H = sqrt3 / 2 * P
@@ -407,18 +552,10 @@ class Screw:
         sweep_path = Part.Wire([main_helix, lead_out_helix])
         # use Part.BrepOffsetAPI to sweep the thread profile
         # ref: https://forum.freecadweb.org/viewtopic.php?t=21636#p168339
-        sweep = Part.BRepOffsetAPI.MakePipeShell(sweep_path)
-        sweep.setFrenetMode(True)
-        sweep.setTransitionMode(1)  # right corner transition
-        sweep.add(thread_profile_wire)
-        if sweep.isReady():
-            sweep.build()
-        else:
-            # geometry couldn't be generated in a usable form
-            raise RuntimeError(
-                "Failed to create shell thread: could not sweep thread")
-        sweep.makeSolid()
-        threads = sweep.shape()
+        # right corner transition
+        threads = self.MakePipeShell(
+            sweep_path, [thread_profile_wire], 1,
+            "Failed to create shell thread: could not sweep thread")
         top_remover = Part.makeBox(
             2 * dia,
             2 * dia,
@@ -439,6 +576,12 @@ class Screw:
         P: thread pitch
         blen: usable threaded length, measured from the base of the cutter
         """
+        return self.GetCachedPart(
+            ("BlindInnerThreadCutter", dia, P, blen, self.LeftHanded, self.GetThreadQuality(),
+             self.RingThreadsEnabled()),
+            self.makeBlindInnerThreadCutter, dia, P, blen)
+
+    def makeBlindInnerThreadCutter(self, dia: float, P: float, blen: float) -> Part.Shape:
         # simulate a 118 degree drill point at the end of the solid
         conic_height = 0.55 * dia / math.tan(math.radians(59))
         if blen <= conic_height:
@@ -449,14 +592,14 @@ class Screw:
         inner_rad = dia / 2 - 0.625 * sqrt3 / 2 * P
         core = Part.makeCylinder(inner_rad, blen + 1.1 * conic_height + 1)
         core.translate(Base.Vector(0.0, 0.0, -1.0))
-        obj = core.fuse(threads)
         fm = FastenerBase.FSFaceMaker()
         fm.AddPoint(0.0, 0.0)
         fm.AddPoint(0.55 * dia, 0.0)
         fm.AddPoint(0.55 * dia, blen)
         fm.AddPoint(0.0, blen + conic_height)
         drill = self.RevolveZ(fm.GetFace())
-        obj = obj.common(drill)
+        # drill AND (core OR threads) in a single boolean
+        obj = drill.common([core, threads])
         return Part.Solid(obj)
 
     @staticmethod
@@ -489,6 +632,56 @@ class Screw:
         solid = hexagon.extrude(Base.Vector(0.0, 0.0, height))
         return solid
 
+    @classmethod
+    def makeChamferedHexPrism(
+        cls, width: float, height: float, chamTop: float, chamBottom: float = 0.0
+    ) -> Part.Shape:
+        """create a hexagonal prism with chamfered corners, as used for hex
+        heads and nuts. The chamfer cones start at the flats of the top and
+        bottom faces and end at the corners chamTop / chamBottom from them.
+        Parameters:
+        - width: width across flats
+        - height: overall height of the prism
+        - chamTop, chamBottom: chamfer height at the corners, 0 for no chamfer
+        """
+        return cls.GetCachedPart(
+            ("ChamferedHexPrism", width, height, chamTop, chamBottom),
+            cls.makeChamferedHexPrismShape, width, height, chamTop, chamBottom)
+
+    @classmethod
+    def makeChamferedHexPrismShape(
+        cls, width: float, height: float, chamTop: float, chamBottom: float
+    ) -> Part.Shape:
+        prism = cls.makeHexPrism(width, height)
+        cutters = []
+        for z, dz, cham in ((height, 1.0, chamTop), (0.0, -1.0, chamBottom)):
+            if cham <= 0.0:
+                continue
+            # triangle outside of the chamfer cone, extended beyond the prism
+            x0, z0 = width / 2.0, z
+            x1, z1 = width / sqrt3, z - dz * cham
+            xa, za = x0 - (x1 - x0) * 0.1, z0 - (z1 - z0) * 0.1
+            xb, zb = x1 + (x1 - x0) * 0.1, z1 + (z1 - z0) * 0.1
+            fm = FSFaceMaker()
+            fm.AddPoints((xa, za), (xb, zb), (xb, za))
+            cutters.append(cls.RevolveZ(fm.GetFace()))
+        if cutters:
+            prism = prism.cut(cutters)
+        return prism
+
+    @classmethod
+    def GetCachedPart(cls, key, make, *args) -> Part.Shape:
+        """Return a copy of the part stored for key. The part is created by
+        calling make(*args) the first time."""
+        part = cls.partCache.pop(key, None)
+        if part is None:
+            part = make(*args)
+            while len(cls.partCache) >= cls.partCacheSize:
+                del cls.partCache[next(iter(cls.partCache))]
+        # (re)insert as the most recently used part
+        cls.partCache[key] = part
+        return part.copy(False)
+
     @classmethod
     def makeHCrossRecess(cls, CrossType: str, m: float) -> Part.Shape:
         """Create a Cross recess of type H.
@@ -498,6 +691,10 @@ class Screw:
         - m: Functional outer diameter of the recess.
              This also affects the overall height of the resulting shape.
         """
+        return cls.GetCachedPart(("HCross", CrossType, m), cls.makeHCrossRecessShape, CrossType, m)
+
+    @classmethod
+    def makeHCrossRecessShape(cls, CrossType: str, m: float) -> Part.Shape:
         b, e_mean, g, f_mean, r, t1, alpha, beta = FsData["iso4757def"][CrossType]
 
         rad265 = math.radians(26.5)
@@ -552,15 +749,11 @@ class Screw:
         isFrenet = False
         corner = Part.Wire(edgeC1).makePipeShell(
             [wire_t_tot], makeSolid, isFrenet)
-        for i in range(4):
-            cross = cross.cut(
-                corner.rotated(
-                    Base.Vector(0, 0, 0),
-                    Base.Vector(0, 0, 1),
-                    90 * i
-                )
-            )
-        return Part.Solid(cross)
+        corners = [
+            corner.rotated(Base.Vector(0, 0, 0), Base.Vector(0, 0, 1), 90 * i)
+            for i in range(4)
+        ]
+        return Part.Solid(cross.cut(corners))
 
     @classmethod
     def makeHexRecess(cls, width: float, depth: float, chamfer: bool) -> Part.Shape:
@@ -713,8 +906,10 @@ class Screw:
         if self.sm3DPrintMode:
             if isNut:
                 dia = self.smNutThrScaleA * dia + self.smNutThrScaleB
+                self.scaledThreads.add("NutScale")
             else:
                 dia = self.smScrewThrScaleA * dia + self.smScrewThrScaleB
+                self.scaledThreads.add("ScrewScale")
         return dia
 
     # NOTE:
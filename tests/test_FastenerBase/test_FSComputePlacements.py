@@ -0,0 +1,52 @@
+import math
+from pytest import importorskip
+
+importorskip('numpy')
+importorskip('FreeCAD')
+from FreeCAD import Rotation, Vector
+from FastenerBase import FSComputePlacements
+
+TOL = 1e-9
+
+
+def place(center, axis, invert=False, offset=0.0, offsetAngle=0.0):
+    return FSComputePlacements([center], [axis], [invert], [offset], [offsetAngle])[0]
+
+
+def test_z_axis_is_identity():
+    pl = place((1, 2, 3), (0, 0, 1))
+    assert pl.Base.isEqual(Vector(1, 2, 3), TOL)
+    assert pl.Rotation.isSame(Rotation(), TOL)
+
+
+def test_fastener_axis_follows_attachment_axis():
+    for axis in [(1, 0, 0), (0, -1, 0), (0, 0, -1), (1, 1, 1)]:
+        pl = place((0, 0, 0), axis)
+        expected = Vector(*axis).normalize()
+        assert pl.Rotation.multVec(Vector(0, 0, 1)).isEqual(expected, TOL)
+
+
+def test_invert_and_offset():
+    pl = place((1, 2, 3), (1, 0, 0), invert=True, offset=2.0)
+    assert pl.Base.isEqual(Vector(-1, 2, 3), TOL)
+    assert pl.Rotation.multVec(Vector(0, 0, 1)).isEqual(Vector(-1, 0, 0), TOL)
+
+
+def test_offset_angle_turns_around_fastener_axis():
+    pl = place((0, 0, 0), (0, 0, 1), offsetAngle=90.0)
+    assert pl.Rotation.multVec(Vector(1, 0, 0)).isEqual(Vector(0, 1, 0), TOL)
+    pl = place((0, 0, 0), (1, 0, 0), offsetAngle=90.0)
+    assert pl.Rotation.multVec(Vector(0, 0, 1)).isEqual(Vector(1, 0, 0), TOL)
+    assert math.isclose(math.degrees(pl.Rotation.Angle), 120.0)
+
+
+def test_batch_matches_single():
+    centers = [(0, 0, 0), (5, 0, 0), (0, 5, 1)]
+    axes = [(0, 0, 1), (0, 1, 0), (-1, 0, 0)]
+    inverts = [False, True, False]
+    offsets = [0.0, 1.0, -2.0]
+    angles = [0.0, 45.0, 30.0]
+    placements = FSComputePlacements(centers, axes, inverts, offsets, angles)
+    assert len(placements) == 3
+    for i, pl in enumerate(placements):
+        assert pl.isSame(place(centers[i], axes[i], inverts[i], offsets[i], angles[i]), TOL)
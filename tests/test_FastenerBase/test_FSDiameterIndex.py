@@ -0,0 +1,33 @@
+from pytest import importorskip
+
+Part = importorskip('Part')
+FreeCAD = importorskip('FreeCAD')
+from FastenerBase import FSAutoDiameterM, FSDiameterIndex
+
+TEST_TABLE = {
+    'M3': (0.0, 3.0),
+    'M4': (0.0, 4.0),
+    'M5': (0.0, 5.0),
+    'M6': (0.0, 6.0),
+    'M8': (0.0, 8.0),
+}
+
+
+def test_table_column():
+    # table diameters are enlarged by 0.1 before the lookup
+    index = FSDiameterIndex(TEST_TABLE, 1)
+    assert index.Find(4.05) == 'M4'
+    assert index.Find(4.1) == 'M5'
+
+
+def test_diameter_names():
+    index = FSDiameterIndex(['M6', 'M3', 'M4'], -1)
+    assert index.Find(3.5) == 'M4'
+
+
+def test_same_as_FSAutoDiameterM():
+    index = FSDiameterIndex(TEST_TABLE, 1)
+    for i in range(1, 120):
+        d = i * 0.1
+        hole = Part.makeCircle(d / 2, FreeCAD.Vector(0, 0, 0))
+        assert index.Find(d) == FSAutoDiameterM(hole, TEST_TABLE, 1)
@@ -0,0 +1,68 @@
+from pytest import importorskip
+
+importorskip('FreeCAD')
+from FastenerBase import FSFaceMaker
+
+
+def make_square():
+    fm = FSFaceMaker()
+    fm.AddPoint(0, 0)
+    fm.AddPoint(1, 0)
+    fm.AddPoint(1, 1)
+    fm.AddPoint(0, 1)
+    return fm
+
+
+def test_straight_lines_are_one_segment():
+    fm = make_square()
+    assert fm.segments == [('line', [(0, 0), (1, 0), (1, 1), (0, 1)])]
+
+
+def test_closed_segments():
+    fm = make_square()
+    assert fm.GetSegments(True) == [('line', [(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)])]
+    # closing does not change the maker state
+    assert fm.GetSegments(False) == [('line', [(0, 0), (1, 0), (1, 1), (0, 1)])]
+
+
+def test_arcs_split_the_lines():
+    fm = FSFaceMaker()
+    fm.AddPoints((0, 0), (2, 0), (3, 1, 2, 2), (0, 2))
+    assert fm.segments == [
+        ('line', [(0, 0), (2, 0)]),
+        ('arc', (2, 0), (3, 1), (2, 2)),
+        ('line', [(2, 2), (0, 2)]),
+    ]
+    # the closing line extends the last straight run
+    assert fm.GetSegments(True)[-1] == ('line', [(2, 2), (0, 2), (0, 0)])
+
+
+def test_closing_after_curve():
+    fm = FSFaceMaker()
+    fm.AddPoint(0, 0)
+    fm.AddPoint(1, 0)
+    fm.AddBSpline(1, 1, 0, 1)
+    assert fm.GetSegments(True)[-2:] == [
+        ('bspline', [(1, 0), (1, 1), (0, 1)]),
+        ('line', [(0, 1), (0, 0)]),
+    ]
+
+
+def test_relative_points():
+    fm = FSFaceMaker()
+    fm.StartPoint(1, 1)
+    fm.AddPointRelative(2, 0)
+    fm.AddPointRelative(0, -1)
+    assert fm.segments == [('line', [(1, 1), (3, 1), (3, 0)])]
+
+
+def test_wire_edges():
+    fm = make_square()
+    wire = fm.GetClosedWire()
+    assert wire.isClosed()
+    assert len(wire.Edges) == 4
+    face = fm.GetFace()
+    assert abs(face.Area - 1.0) < 1e-9
+    fm = FSFaceMaker()
+    fm.AddPoints((0, 0), (2, 0), (3, 1, 2, 2), (0, 2))
+    assert len(fm.GetClosedWire().Edges) == 4
@@ -0,0 +1,56 @@
+import io
+import json
+from FSutils import FSBomCsvWriter, FSBomJsonLinesWriter, FSBomJsonWriter, FSWriteBom
+
+TEST_BOM = {
+    'ISO4017 Screw M3x10': 4,
+    'DIN934 Nut M3': 4,
+    'ISO7089 Washer M3': 8,
+}
+
+
+def test_csv_writer():
+    stream = io.StringIO()
+    FSWriteBom(TEST_BOM, FSBomCsvWriter(stream))
+    assert stream.getvalue().splitlines() == [
+        'Type,Qty',
+        'DIN934 Nut M3,4',
+        'ISO4017 Screw M3x10,4',
+        'ISO7089 Washer M3,8',
+    ]
+
+
+def test_csv_writer_quoting():
+    stream = io.StringIO()
+    FSWriteBom({'Threaded Rod M3, 100mm': 1}, FSBomCsvWriter(stream, delimiter=","))
+    assert stream.getvalue().splitlines()[1] == '"Threaded Rod M3, 100mm",1'
+
+
+def test_json_lines_writer():
+    stream = io.StringIO()
+    FSWriteBom(TEST_BOM, FSBomJsonLinesWriter(stream))
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {'type': 'DIN934 Nut M3', 'qty': 4},
+        {'type': 'ISO4017 Screw M3x10', 'qty': 4},
+        {'type': 'ISO7089 Washer M3', 'qty': 8},
+    ]
+
+
+def test_json_writer():
+    stream = io.StringIO()
+    FSWriteBom(TEST_BOM, FSBomJsonWriter(stream))
+    assert json.loads(stream.getvalue()) == [
+        {'type': 'DIN934 Nut M3', 'qty': 4},
+        {'type': 'ISO4017 Screw M3x10', 'qty': 4},
+        {'type': 'ISO7089 Washer M3', 'qty': 8},
+    ]
+
+
+def test_empty_bom():
+    stream = io.StringIO()
+    FSWriteBom({}, FSBomJsonWriter(stream))
+    assert json.loads(stream.getvalue()) == []
+    stream = io.StringIO()
+    FSWriteBom({}, FSBomCsvWriter(stream))
+    assert stream.getvalue().splitlines() == ['Type,Qty']
@@ -0,0 +1,41 @@
+from collections import namedtuple
+from FSutils import FSPositionIndex
+
+# stands in for the FreeCAD vectors of edge centers
+Point = namedtuple('Point', 'x y z')
+
+
+def test_contains_added_position():
+    index = FSPositionIndex()
+    index.add(Point(10, 20, 30), 2.5)
+    assert index.contains(Point(10, 20, 30), 2.5)
+
+
+def test_empty_index():
+    index = FSPositionIndex()
+    assert not index.contains(Point(0, 0, 0), 1.0)
+
+
+def test_other_center_or_radius():
+    index = FSPositionIndex()
+    index.add(Point(10, 20, 30), 2.5)
+    assert not index.contains(Point(10, 20, 31), 2.5)
+    assert not index.contains(Point(10, 20, 30), 3.0)
+
+
+def test_within_tolerance_in_neighbour_cell():
+    # the positions are rounded into different grid cells,
+    # but are closer than the tolerance
+    index = FSPositionIndex(tol=1e-3)
+    index.add(Point(0.00049, 0, 0), 1.00049)
+    assert index.contains(Point(0.00051, 0, 0), 1.00051)
+    assert index.contains(Point(-0.0004, 0, 0), 0.9996)
+
+
+def test_outside_tolerance():
+    index = FSPositionIndex(tol=1e-3)
+    index.add(Point(0, 0, 0), 1.0)
+    assert not index.contains(Point(0.0025, 0, 0), 1.0)
+    assert not index.contains(Point(0, 0, 0), 1.0025)
+    # the tolerance is a distance, not a per coordinate limit
+    assert not index.contains(Point(0.0008, 0.0008, 0), 1.0)
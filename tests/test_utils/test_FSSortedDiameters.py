@@ -0,0 +1,50 @@
+from FSutils import FSSortedDiameters
+
+TEST_DIAMETERS = [(3.1, 'M3'), (8.1, 'M8'), (4.1, 'M4'), (6.1, 'M6'), (5.1, 'M5')]
+
+
+def test_find_next_larger_diameter():
+    index = FSSortedDiameters(TEST_DIAMETERS)
+    assert index.Find(2.0) == 'M3'
+    assert index.Find(3.5) == 'M4'
+    assert index.Find(6.5) == 'M8'
+
+
+def test_find_strictly_larger():
+    index = FSSortedDiameters(TEST_DIAMETERS)
+    assert index.Find(4.05) == 'M4'
+    assert index.Find(4.1) == 'M5'
+
+
+def test_find_out_of_range():
+    index = FSSortedDiameters(TEST_DIAMETERS)
+    assert index.Find(20.0) == 'M5'
+    # more than 10 below the smallest diameter
+    assert index.Find(-8.0) == 'M5'
+    assert index.Find(-6.0) == 'M3'
+
+
+def test_equal_diameters_keep_table_order():
+    index = FSSortedDiameters([(2.0, 'B'), (2.0, 'A'), (3.0, 'C')])
+    assert index.Find(1.5) == 'B'
+
+
+def test_empty_table():
+    assert FSSortedDiameters([]).Find(3.0) == 'M5'
+
+
+def test_same_as_linear_search():
+    # the linear search of FSAutoDiameterM
+    def linear(d):
+        res = 'M5'
+        mindif = 10.0
+        for dia, name in TEST_DIAMETERS:
+            if dia > d and dia - d < mindif:
+                mindif = dia - d
+                res = name
+        return res
+
+    index = FSSortedDiameters(TEST_DIAMETERS)
+    for i in range(-120, 200):
+        d = i * 0.1
+        assert index.Find(d) == linear(d)